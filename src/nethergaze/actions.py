@@ -2,14 +2,18 @@
 
 from __future__ import annotations
 
+import shlex
 import shutil
+from functools import lru_cache
 
 
+@lru_cache(maxsize=1)
 def detect_firewall() -> str:
     """Detect installed firewall tool.
 
     Returns 'ufw', 'nft', 'iptables', or 'unknown'.
     Checks in order of preference (ufw wraps iptables/nft, so prefer it).
+    The result is cached for the life of the process.
     """
     for tool in ("ufw", "nft", "iptables"):
         if shutil.which(tool):
@@ -24,12 +28,43 @@ def generate_block_command(ip: str, firewall: str | None = None) -> str:
     """
     if firewall is None:
         firewall = detect_firewall()
+    argv = _block_argv(ip, firewall)
+    if argv is None:
+        return f"# No supported firewall detected. Block {ip} manually."
+    return shlex.join(argv)
+
+
+def generate_block_argv(ip: str, firewall: str | None = None) -> list[str] | None:
+    """Argument vector for the block command, or None if no firewall is known.
+
+    Suitable for subprocess without a shell.
+    """
+    if firewall is None:
+        firewall = detect_firewall()
+    argv = _block_argv(ip, firewall)
+    return list(argv) if argv is not None else None
+
+
+@lru_cache(maxsize=4096)
+def _block_argv(ip: str, firewall: str) -> tuple[str, ...] | None:
     match firewall:
         case "ufw":
-            return f"sudo ufw insert 1 deny from {ip}"
+            return ("sudo", "ufw", "insert", "1", "deny", "from", ip)
         case "nft":
-            return f"sudo nft add rule inet filter input ip saddr {ip} drop"
+            return (
+                "sudo",
+                "nft",
+                "add",
+                "rule",
+                "inet",
+                "filter",
+                "input",
+                "ip",
+                "saddr",
+                ip,
+                "drop",
+            )
         case "iptables":
-            return f"sudo iptables -I INPUT -s {ip} -j DROP"
+            return ("sudo", "iptables", "-I", "INPUT", "-s", ip, "-j", "DROP")
         case _:
-            return f"# No supported firewall detected. Block {ip} manually."
+            return None
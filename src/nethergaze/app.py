@@ -3,15 +3,17 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from textual.app import App
+from textual.app import App, ScreenStackError
 
-from nethergaze.collectors.logs import LogWatcher, MultiLogWatcher
-from nethergaze.config import AppConfig
 from nethergaze.correlation import CorrelationEngine
-from nethergaze.enrichment.geoip import GeoIPLookup
-from nethergaze.enrichment.whois_lookup import WhoisLookupService
-from nethergaze.screens.dashboard import DashboardScreen
+
+if TYPE_CHECKING:
+    from nethergaze.collectors.logs import LogWatcher, MultiLogWatcher
+    from nethergaze.config import AppConfig
+    from nethergaze.enrichment.geoip import GeoIPLookup
+    from nethergaze.enrichment.whois_lookup import WhoisLookupService
 
 
 class NethergazeApp(App):
@@ -40,16 +42,20 @@ class NethergazeApp(App):
         super().__init__()
         self.config = config
 
-        self.engine = CorrelationEngine()
+        self.engine = CorrelationEngine(max_profiles=config.max_tracked_ips)
 
         self.geoip: GeoIPLookup | None = None
         if config.geoip_enabled:
+            from nethergaze.enrichment.geoip import GeoIPLookup
+
             self.geoip = GeoIPLookup(config.geoip_city_db, config.geoip_asn_db)
             if not self.geoip.available:
                 self.geoip = None
 
         self.whois: WhoisLookupService | None = None
         if config.whois_enabled:
+            from nethergaze.enrichment.whois_lookup import WhoisLookupService
+
             self.whois = WhoisLookupService(
                 max_workers=config.whois_max_workers,
                 cache_ttl=config.whois_cache_ttl,
@@ -60,20 +66,26 @@ class NethergazeApp(App):
 
         self.log_watcher: LogWatcher | MultiLogWatcher | None = None
         if config.log_path:
+            from nethergaze.collectors.logs import LogWatcher, MultiLogWatcher
+
             if any(c in config.log_path for c in "*?["):
                 self.log_watcher = MultiLogWatcher(
                     config.log_path,
                     max_entries_per_ip=config.max_log_entries_per_ip,
                     log_format=config.log_format,
+                    keep_raw_line=config.keep_raw_line,
                 )
             elif Path(config.log_path).exists():
                 self.log_watcher = LogWatcher(
                     config.log_path,
                     max_entries_per_ip=config.max_log_entries_per_ip,
                     log_format=config.log_format,
+                    keep_raw_line=config.keep_raw_line,
                 )
 
     def on_mount(self) -> None:
+        from nethergaze.screens.dashboard import DashboardScreen
+
         self.push_screen(
             DashboardScreen(
                 config=self.config,
@@ -84,36 +96,22 @@ class NethergazeApp(App):
             )
         )
 
-    def _delegate(self, action: str) -> None:
-        """Delegate an action to the current screen if it supports it."""
-        screen = self.screen
-        method = getattr(screen, action, None)
-        if method:
-            method()
-
-    def action_cycle_sort(self) -> None:
-        self._delegate("action_cycle_sort")
-
-    def action_whois_selected(self) -> None:
-        self._delegate("action_whois_selected")
-
-    def action_refresh(self) -> None:
-        self._delegate("action_refresh")
-
-    def action_filter_log(self) -> None:
-        self._delegate("action_filter_log")
-
-    def action_open_filters(self) -> None:
-        self._delegate("action_open_filters")
-
-    def action_toggle_suspicious(self) -> None:
-        self._delegate("action_toggle_suspicious")
-
-    def action_copy_ip(self) -> None:
-        self._delegate("action_copy_ip")
-
-    def action_suggest_block(self) -> None:
-        self._delegate("action_suggest_block")
+    def __getattr__(self, name: str):
+        """Delegate unknown ``action_*`` lookups to the current screen.
+
+        Textual resolves bindings with getattr, so app-level bindings reach
+        whichever screen implements the action without per-action stubs.
+        """
+        if name.startswith("action_"):
+            try:
+                method = getattr(self.screen, name, None)
+            except ScreenStackError:
+                method = None
+            if method is not None:
+                return method
+        raise AttributeError(
+            f"{type(self).__name__!r} object has no attribute {name!r}"
+        )
 
     def action_help(self) -> None:
         from nethergaze.screens.help_screen import HelpScreen
@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
-import argparse
+import sys
+from typing import TYPE_CHECKING
 
 from nethergaze import __version__
-from nethergaze.config import AppConfig
+
+if TYPE_CHECKING:
+    import argparse
 
 
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     """Parse command-line arguments."""
+    import argparse
+
     parser = argparse.ArgumentParser(
         prog="nethergaze",
         description="Real-time VPS network traffic dashboard",
@@ -65,6 +70,13 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
 
 def main(argv: list[str] | None = None) -> None:
     """Main entry point."""
+    if argv is None:
+        argv = sys.argv[1:]
+    # Fast path for health checks: skip building the full parser
+    if argv == ["--version"]:
+        print(f"nethergaze {__version__}")
+        return
+
     args = parse_args(argv)
 
     # Build CLI overrides dict
@@ -84,6 +96,8 @@ def main(argv: list[str] | None = None) -> None:
     if args.no_whois:
         overrides["whois_enabled"] = False
 
+    from nethergaze.config import AppConfig
+
     config = AppConfig.load(config_path=args.config, cli_overrides=overrides)
 
     from nethergaze.app import NethergazeApp
@@ -2,24 +2,108 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import shutil
+import sqlite3
 import subprocess
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
 
 from nethergaze.models import BandwidthStats
 
+_VNSTAT_DB = "/var/lib/vnstat/vnstat.db"
+# vnstatd only flushes to its database every few minutes
+_CACHE_TTL = 30.0
+
+_cache: dict[str, tuple[float, BandwidthStats | None]] = {}
+_db_connections: dict[str, sqlite3.Connection] = {}
+_lock = threading.Lock()
+
 
 def get_bandwidth(interface: str = "eth0") -> BandwidthStats | None:
     """Get current month bandwidth from vnstat.
 
+    Reads vnstat's database directly when possible, falling back to the
+    vnstat CLI. Results are cached per interface for ``_CACHE_TTL`` seconds.
     Returns None if vnstat is not installed or data unavailable.
     """
-    if not shutil.which("vnstat"):
+    now = time.monotonic()
+    with _lock:
+        cached = _cache.get(interface)
+        if cached is not None and now - cached[0] < _CACHE_TTL:
+            return cached[1]
+        stats = _read_vnstat_db(interface)
+    # The CLI can take seconds; don't hold up other callers' cache hits
+    if stats is None:
+        stats = _run_vnstat(interface)
+    with _lock:
+        _cache[interface] = (now, stats)
+    return stats
+
+
+async def get_bandwidth_async(interface: str = "eth0") -> BandwidthStats | None:
+    """Like get_bandwidth, but awaits the vnstat CLI instead of blocking on it."""
+    now = time.monotonic()
+    with _lock:
+        cached = _cache.get(interface)
+        if cached is not None and now - cached[0] < _CACHE_TTL:
+            return cached[1]
+        stats = _read_vnstat_db(interface)
+    if stats is None:
+        stats = await _run_vnstat_async(interface)
+    with _lock:
+        _cache[interface] = (now, stats)
+    return stats
+
+
+def _read_vnstat_db(interface: str, db_path: str = _VNSTAT_DB) -> BandwidthStats | None:
+    """Read the current month's totals straight from vnstat's sqlite database."""
+    conn = _db_connections.get(db_path)
+    try:
+        if conn is None:
+            if not Path(db_path).is_file():
+                return None
+            conn = sqlite3.connect(
+                f"{Path(db_path).absolute().as_uri()}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+            )
+            _db_connections[db_path] = conn
+        row = conn.execute(
+            "SELECT month.rx, month.tx FROM month"
+            " JOIN interface ON month.interface = interface.id"
+            " WHERE interface.name = ? ORDER BY month.date DESC LIMIT 1",
+            (interface,),
+        ).fetchone()
+    except sqlite3.Error:
+        if conn is not None:
+            conn.close()
+        _db_connections.pop(db_path, None)
+        return None
+
+    if row is None:
+        return None
+    return BandwidthStats(rx_bytes=row[0], tx_bytes=row[1])
+
+
+@lru_cache(maxsize=1)
+def _vnstat_path() -> str | None:
+    """Locate the vnstat binary once per process."""
+    return shutil.which("vnstat")
+
+
+def _run_vnstat(interface: str) -> BandwidthStats | None:
+    """Query the vnstat CLI for monthly totals."""
+    vnstat = _vnstat_path()
+    if not vnstat:
         return None
 
     try:
         result = subprocess.run(
-            ["vnstat", "--json", "m", "-i", interface],
+            [vnstat, "--json", "m", "-i", interface],
             capture_output=True,
             text=True,
             timeout=5,
@@ -31,6 +115,35 @@ def get_bandwidth(interface: str = "eth0") -> BandwidthStats | None:
         return None
 
 
+async def _run_vnstat_async(interface: str) -> BandwidthStats | None:
+    """Query the vnstat CLI for monthly totals without blocking the event loop."""
+    vnstat = _vnstat_path()
+    if not vnstat:
+        return None
+
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            vnstat,
+            "--json",
+            "m",
+            "-i",
+            interface,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+    except OSError:
+        return None
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=5)
+    except TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return None
+    if proc.returncode != 0:
+        return None
+    return _parse_vnstat_json(stdout.decode(errors="replace"))
+
+
 def _parse_vnstat_json(raw: str) -> BandwidthStats | None:
     """Parse vnstat JSON monthly output."""
     try:
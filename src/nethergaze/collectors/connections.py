@@ -1,9 +1,15 @@
-"""TCP connection collector reading /proc/net/tcp and /proc/net/tcp6."""
+"""TCP connection collector using sock_diag netlink, with /proc/net/tcp fallback."""
 
 from __future__ import annotations
 
 import os
-from pathlib import Path
+import re
+import socket
+import struct
+import sys
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
 
 from nethergaze.models import Connection, TCPState
 from nethergaze.utils import (
@@ -13,137 +19,441 @@ from nethergaze.utils import (
     parse_hex_port,
 )
 
+# sock_diag netlink protocol (linux/netlink.h, linux/sock_diag.h, linux/inet_diag.h)
+_NETLINK_SOCK_DIAG = getattr(socket, "NETLINK_SOCK_DIAG", 4)
+_SOCK_DIAG_BY_FAMILY = 20
+_NLM_F_REQUEST = 0x1
+_NLM_F_DUMP = 0x300
+_NLMSG_ERROR = 2
+_NLMSG_DONE = 3
+_TCP_STATES_NO_LISTEN = 0xFFFFFFFF & ~(1 << TCPState.LISTEN.value)
+
+# struct nlmsghdr: len, type, flags, seq, pid
+_NLMSG_HDR = struct.Struct("=IHHII")
+# struct inet_diag_req_v2: family, protocol, ext, pad, states, inet_diag_sockid
+_INET_DIAG_REQ = struct.Struct("=BBBxI48x")
+# struct inet_diag_msg: family, state, timer, retrans, sport, dport, src, dst,
+# (if, cookie, expires, rqueue, wqueue, uid skipped), inode
+_INET_DIAG_MSG = struct.Struct("=BB2xHH16s16s28xI")
+
+_RECV_BUF_SIZE = 1 << 16
+
+# /proc/net/tcp{,6} row: "sl local:port rem:port st tx:rx tr:when retrnsmt uid
+# timeout inode ..." — five columns sit between the state and the inode.
+# Patterns are bytes and anchored per line so a whole file can be scanned with
+# finditer() without decoding or splitting it.
+_TCP_LINE_TAIL = rb"[ \t]+([0-9A-Fa-f]{2})(?:[ \t]+\S+){5}[ \t]+(\d+)"
+_TCP4_LINE = re.compile(
+    rb"^[ \t]*\d+:[ \t]+([0-9A-Fa-f]{8}):([0-9A-Fa-f]{4})"
+    rb"[ \t]+([0-9A-Fa-f]{8}):([0-9A-Fa-f]{4})" + _TCP_LINE_TAIL,
+    re.MULTILINE,
+)
+_TCP6_LINE = re.compile(
+    rb"^[ \t]*\d+:[ \t]+([0-9A-Fa-f]{32}):([0-9A-Fa-f]{4})"
+    rb"[ \t]+([0-9A-Fa-f]{32}):([0-9A-Fa-f]{4})" + _TCP_LINE_TAIL,
+    re.MULTILINE,
+)
+
+# Remote addresses never reported: loopback and unspecified, as raw
+# network-order bytes (sock_diag) and as /proc/net/tcp{,6} hex
+_SKIP_REMOTE_RAW = frozenset(
+    {
+        socket.inet_pton(socket.AF_INET, "127.0.0.1"),
+        socket.inet_pton(socket.AF_INET, "0.0.0.0"),
+        socket.inet_pton(socket.AF_INET6, "::1"),
+        socket.inet_pton(socket.AF_INET6, "::"),
+    }
+)
+_SKIP_REMOTE_HEX = frozenset(
+    {
+        b"0100007F",
+        b"00000000",
+        b"00000000000000000000000001000000",
+        b"00000000000000000000000000000000",
+    }
+)
+_LISTEN_HEX = frozenset({b"0A", b"0a"})
+
+# Below this many PIDs to scan, thread handoff costs more than it saves
+_PARALLEL_SCAN_MIN = 64
+_scan_pool: ThreadPoolExecutor | None = None
+
+# Read buffer for /proc/net/tcp{,6}, one per thread: connection workers can
+# overlap, so a shared buffer could be refilled mid-parse
+_proc_local = threading.local()
+
+
+def _proc_buf() -> bytearray:
+    buf = getattr(_proc_local, "buf", None)
+    if buf is None:
+        buf = _proc_local.buf = bytearray(64 * 1024)
+    return buf
+
 
 def get_connections(
     include_private: bool = False,
     proc_path: str = "/proc",
 ) -> list[Connection]:
-    """Read active TCP connections from /proc/net/tcp and tcp6.
+    """Read active TCP connections via sock_diag, falling back to /proc/net/tcp*.
+
+    The netlink dump is only used against the live /proc; a custom proc_path
+    (e.g. a test fixture) always goes through the text parser.
 
     Returns a list of Connection objects for non-listening, non-local connections.
     """
-    inode_to_pid = _build_inode_pid_map(proc_path)
+    raw: list[Connection] | None = None
+    if proc_path == "/proc":
+        raw = _dump_netlink_connections()
+    if raw is None:
+        raw = _read_proc_connections(proc_path)
+
+    # LISTEN sockets and loopback/unspecified remotes are already dropped by
+    # both readers, before any address is formatted.
+    if include_private:
+        connections = raw
+    else:
+        connections = [c for c in raw if not is_private_ip(c.remote_ip)]
+
+    # Map inode to PID
+    cache = _default_inode_cache if proc_path == "/proc" else InodePidCache(proc_path)
+    inode_to_pid = cache.refresh(c.inode for c in connections)
+    for conn in connections:
+        pid_info = inode_to_pid.get(conn.inode)
+        if pid_info:
+            conn.pid, conn.process_name = pid_info
+
+    return connections
+
+
+def _dump_netlink_connections() -> list[Connection] | None:
+    """Dump TCP sockets for both address families over NETLINK_SOCK_DIAG.
+
+    Returns None when netlink is unavailable so the caller can fall back to
+    parsing /proc/net/tcp as text.
+    """
+    if not hasattr(socket, "AF_NETLINK"):
+        return None
+    try:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, _NETLINK_SOCK_DIAG)
+    except OSError:
+        return None
+
     connections: list[Connection] = []
+    buf = bytearray(_RECV_BUF_SIZE)
+    try:
+        for seq, family in enumerate((socket.AF_INET, socket.AF_INET6), start=1):
+            if not _netlink_dump_family(sock, family, seq, buf, connections):
+                return None
+    except OSError:
+        return None
+    finally:
+        sock.close()
+    return connections
+
 
-    for proto_file, parser in [
-        ("net/tcp", _parse_tcp4_line),
-        ("net/tcp6", _parse_tcp6_line),
+def _netlink_dump_family(
+    sock: socket.socket,
+    family: int,
+    seq: int,
+    buf: bytearray,
+    out: list[Connection],
+) -> bool:
+    """Send one inet_diag dump request and parse replies into ``out``.
+
+    Returns False if the kernel rejected the request.
+    """
+    payload = _INET_DIAG_REQ.pack(family, socket.IPPROTO_TCP, 0, _TCP_STATES_NO_LISTEN)
+    header = _NLMSG_HDR.pack(
+        _NLMSG_HDR.size + len(payload),
+        _SOCK_DIAG_BY_FAMILY,
+        _NLM_F_REQUEST | _NLM_F_DUMP,
+        seq,
+        0,
+    )
+    sock.send(header + payload)
+
+    addr_len = 4 if family == socket.AF_INET else 16
+    ntop = socket.inet_ntop
+    intern = sys.intern
+    ntohs = socket.ntohs
+    hdr_size = _NLMSG_HDR.size
+    while True:
+        n = sock.recv_into(buf)
+        offset = 0
+        while offset + hdr_size <= n:
+            msg_len, msg_type, _flags, msg_seq, _pid = _NLMSG_HDR.unpack_from(
+                buf, offset
+            )
+            if msg_len < hdr_size:
+                return False
+            if msg_seq == seq:
+                if msg_type == _NLMSG_DONE:
+                    return True
+                if msg_type == _NLMSG_ERROR:
+                    return False
+                if msg_type == _SOCK_DIAG_BY_FAMILY:
+                    _fam, state, sport, dport, src, dst, inode = (
+                        _INET_DIAG_MSG.unpack_from(buf, offset + hdr_size)
+                    )
+                    dst = dst[:addr_len]
+                    try:
+                        tcp_state = TCPState(state)
+                    except ValueError:
+                        tcp_state = None
+                    if tcp_state is not None and dst not in _SKIP_REMOTE_RAW:
+                        out.append(
+                            Connection(
+                                local_ip=ntop(family, src[:addr_len]),
+                                local_port=ntohs(sport),
+                                remote_ip=intern(ntop(family, dst)),
+                                remote_port=ntohs(dport),
+                                state=tcp_state,
+                                inode=inode,
+                            )
+                        )
+            offset += (msg_len + 3) & ~3
+        if n == 0:
+            return False
+
+
+def _read_proc_connections(proc_path: str) -> list[Connection]:
+    """Parse /proc/net/tcp and /proc/net/tcp6, skipping LISTEN and local remotes."""
+    connections: list[Connection] = []
+    for proto_file, pattern, parse_ip in [
+        ("net/tcp", _TCP4_LINE, parse_hex_ipv4),
+        ("net/tcp6", _TCP6_LINE, parse_hex_ipv6),
     ]:
-        filepath = Path(proc_path) / proto_file
-        if not filepath.exists():
-            continue
+        buf = _proc_buf()
         try:
-            lines = filepath.read_text().splitlines()
-        except PermissionError:
+            size = _read_proc_file(f"{proc_path}/{proto_file}", buf)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
             continue
 
-        for line in lines[1:]:  # Skip header
-            conn = parser(line.strip())
-            if conn is None:
-                continue
-            # Skip listening sockets
-            if conn.state == TCPState.LISTEN:
-                continue
-            # Skip loopback
-            if conn.remote_ip in ("127.0.0.1", "::1", "0.0.0.0", "::"):
-                continue
-            # Optionally skip private IPs
-            if not include_private and is_private_ip(conn.remote_ip):
-                continue
-            # Map inode to PID
-            pid_info = inode_to_pid.get(conn.inode)
-            if pid_info:
-                conn.pid, conn.process_name = pid_info
-            connections.append(conn)
+        # The header row never matches, so no need to skip it
+        for m in pattern.finditer(buf, 0, size):
+            conn = _connection_from_match(m, parse_ip)
+            if conn is not None:
+                connections.append(conn)
 
     return connections
 
 
-def _parse_tcp4_line(line: str) -> Connection | None:
-    """Parse a single line from /proc/net/tcp."""
+def _read_proc_file(path: str, buf: bytearray) -> int:
+    """Read a file into ``buf``, growing it in place if needed.
+
+    Returns the number of bytes read. The buffer is reused across refreshes so
+    large socket tables don't churn the allocator every second.
+    """
+    fd = os.open(path, os.O_RDONLY)
     try:
-        fields = line.split()
-        if len(fields) < 10:
-            return None
-
-        local_addr, local_port_hex = fields[1].split(":")
-        remote_addr, remote_port_hex = fields[2].split(":")
-        state_hex = fields[3]
-        inode = int(fields[9])
-
-        return Connection(
-            local_ip=parse_hex_ipv4(local_addr),
-            local_port=parse_hex_port(local_port_hex),
-            remote_ip=parse_hex_ipv4(remote_addr),
-            remote_port=parse_hex_port(remote_port_hex),
-            state=TCPState.from_hex(state_hex),
-            inode=inode,
-        )
-    except (ValueError, IndexError):
+        size = 0
+        while True:
+            if size == len(buf):
+                buf.extend(bytes(len(buf)))
+            with memoryview(buf)[size:] as view:
+                n = os.readv(fd, [view])
+            if n == 0:
+                return size
+            size += n
+    finally:
+        os.close(fd)
+
+
+def _parse_tcp4_line(line: bytes) -> Connection | None:
+    """Parse a single line from /proc/net/tcp."""
+    m = _TCP4_LINE.match(line)
+    if m is None:
         return None
+    return _connection_from_match(m, parse_hex_ipv4)
 
 
-def _parse_tcp6_line(line: str) -> Connection | None:
+def _parse_tcp6_line(line: bytes) -> Connection | None:
     """Parse a single line from /proc/net/tcp6."""
+    m = _TCP6_LINE.match(line)
+    if m is None:
+        return None
+    return _connection_from_match(m, parse_hex_ipv6)
+
+
+def _connection_from_match(
+    m: re.Match[bytes], parse_ip: Callable[[bytes], str]
+) -> Connection | None:
+    local_addr, local_port, remote_addr, remote_port, state_hex, inode = m.groups()
+    if state_hex in _LISTEN_HEX or remote_addr in _SKIP_REMOTE_HEX:
+        return None
     try:
-        fields = line.split()
-        if len(fields) < 10:
-            return None
-
-        local_addr, local_port_hex = fields[1].split(":")
-        remote_addr, remote_port_hex = fields[2].split(":")
-        state_hex = fields[3]
-        inode = int(fields[9])
-
-        return Connection(
-            local_ip=parse_hex_ipv6(local_addr),
-            local_port=parse_hex_port(local_port_hex),
-            remote_ip=parse_hex_ipv6(remote_addr),
-            remote_port=parse_hex_port(remote_port_hex),
-            state=TCPState.from_hex(state_hex),
-            inode=inode,
-        )
-    except (ValueError, IndexError):
+        state = TCPState.from_hex(state_hex)
+    except ValueError:
         return None
+    return Connection(
+        local_ip=parse_ip(local_addr),
+        local_port=parse_hex_port(local_port),
+        remote_ip=sys.intern(parse_ip(remote_addr)),
+        remote_port=parse_hex_port(remote_port),
+        state=state,
+        inode=int(inode),
+    )
 
 
-def _build_inode_pid_map(proc_path: str = "/proc") -> dict[int, tuple[int, str]]:
-    """Build a mapping of socket inode -> (PID, process_name).
+class InodePidCache:
+    """Incrementally maintained socket inode -> (PID, process_name) map.
 
-    Scans /proc/[pid]/fd/ for socket links and /proc/[pid]/comm for names.
+    Each PID's socket table is keyed on its start time from /proc/[pid]/stat,
+    so a recycled PID is always rescanned and exited PIDs are dropped. Because
+    long-lived processes keep opening sockets, fd tables of known PIDs are only
+    rescanned when a requested inode is missing from the map, starting with
+    the PIDs that already own sockets. Inodes that a full rescan could not
+    resolve (sockets of unreadable processes) don't trigger another one.
     """
-    inode_map: dict[int, tuple[int, str]] = {}
-    proc = Path(proc_path)
 
-    if not proc.exists():
-        return inode_map
+    def __init__(self, proc_path: str = "/proc"):
+        self.proc_path = proc_path
+        self._by_pid: dict[int, tuple[bytes, dict[int, tuple[int, str]]]] = {}
+        self._inode_map: dict[int, tuple[int, str]] = {}
+        self._unresolved: set[int] = set()
+        # Connection workers can overlap; refreshes must not interleave
+        self._lock = threading.Lock()
 
-    for pid_dir in proc.iterdir():
-        if not pid_dir.name.isdigit():
-            continue
-        pid = int(pid_dir.name)
-        fd_dir = pid_dir / "fd"
+    def refresh(self, wanted: Iterable[int] = ()) -> dict[int, tuple[int, str]]:
+        """Update the cache and return the merged inode map.
+
+        ``wanted`` is the set of inodes the caller is about to look up; if any
+        of them are unknown and not already known to be unresolvable, every
+        live PID's fd table is rescanned.
+        """
+        with self._lock:
+            return self._refresh(wanted)
 
+    def _refresh(self, wanted: Iterable[int]) -> dict[int, tuple[int, str]]:
         try:
-            comm = (pid_dir / "comm").read_text().strip()
-        except (PermissionError, FileNotFoundError, ProcessLookupError):
-            comm = "?"
+            with os.scandir(self.proc_path) as it:
+                pids = [int(e.name) for e in it if e.name.isdigit()]
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            self._by_pid.clear()
+            self._inode_map = {}
+            return self._inode_map
+
+        live: dict[int, bytes] = {}
+        stale: list[int] = []
+        for pid in pids:
+            starttime = self._read_starttime(pid)
+            if starttime is None:
+                continue
+            live[pid] = starttime
+            cached = self._by_pid.get(pid)
+            if cached is None or cached[0] != starttime:
+                stale.append(pid)
+
+        exited = [p for p in self._by_pid if p not in live]
+        for pid in exited:
+            del self._by_pid[pid]
+
+        if stale or exited:
+            self._scan_into(stale, live)
+            self._rebuild()
 
+        # Inode 0 (TIME_WAIT, orphaned FIN_WAIT2) never has an owning fd
+        missing = {inode for inode in wanted if inode and inode not in self._inode_map}
+        if not missing <= self._unresolved:
+            # New sockets mostly belong to long-lived servers that already
+            # hold some; rescan those first and only then everything else
+            scanned = set(stale)
+            owners = [
+                pid
+                for pid, (_st, sockets) in self._by_pid.items()
+                if sockets and pid not in scanned
+            ]
+            self._scan_into(owners, live)
+            self._rebuild()
+            missing = {inode for inode in missing if inode not in self._inode_map}
+            if not missing <= self._unresolved:
+                scanned.update(owners)
+                self._scan_into([p for p in live if p not in scanned], live)
+                self._rebuild()
+                missing = {i for i in missing if i not in self._inode_map}
+        self._unresolved = missing
+
+        return self._inode_map
+
+    def _scan_into(self, pids: list[int], live: dict[int, bytes]) -> None:
+        """Scan fd tables of ``pids``, in parallel when there are many."""
+        if len(pids) > _PARALLEL_SCAN_MIN:
+            results = zip(pids, _get_scan_pool().map(self._scan_pid, pids))
+        else:
+            results = ((pid, self._scan_pid(pid)) for pid in pids)
+        for pid, sockets in results:
+            self._by_pid[pid] = (live[pid], sockets)
+
+    def _rebuild(self) -> None:
+        merged: dict[int, tuple[int, str]] = {}
+        for _starttime, sockets in self._by_pid.values():
+            merged.update(sockets)
+        self._inode_map = merged
+
+    def _read_starttime(self, pid: int) -> bytes | None:
+        """Return the starttime token (field 22) of /proc/[pid]/stat."""
+        data = _read_small(f"{self.proc_path}/{pid}/stat")
+        if data is None:
+            # Not every proc tree has stat (e.g. test fixtures); treat the
+            # PID as stable so it is still scanned once.
+            return b"" if os.path.isdir(f"{self.proc_path}/{pid}") else None
+        # comm (field 2) may contain spaces and parentheses; skip past it
+        fields = data[data.rfind(b")") + 2 :].split()
+        return fields[19] if len(fields) > 19 else b""
+
+    def _scan_pid(self, pid: int) -> dict[int, tuple[int, str]]:
+        """Scan /proc/[pid]/fd/ for socket links."""
+        sockets: dict[int, tuple[int, str]] = {}
+        comm_raw = _read_small(f"{self.proc_path}/{pid}/comm")
+        comm = comm_raw.decode(errors="replace").strip() if comm_raw else "?"
+
+        # Open the fd directory once and resolve links relative to it, so the
+        # kernel doesn't re-walk /proc/[pid]/fd for every readlink.
+        try:
+            dir_fd = os.open(f"{self.proc_path}/{pid}/fd", os.O_RDONLY | os.O_DIRECTORY)
+        except (PermissionError, FileNotFoundError, ProcessLookupError):
+            return sockets
         try:
-            for fd_link in fd_dir.iterdir():
+            for name in os.listdir(dir_fd):
                 try:
-                    target = os.readlink(str(fd_link))
-                    if target.startswith("socket:["):
-                        inode = int(target[8:-1])
-                        inode_map[inode] = (pid, comm)
-                except (
-                    PermissionError,
-                    FileNotFoundError,
-                    ProcessLookupError,
-                    ValueError,
-                ):
+                    target = os.readlink(name, dir_fd=dir_fd)
+                except (PermissionError, FileNotFoundError, ProcessLookupError):
                     continue
+                if target.startswith("socket:["):
+                    try:
+                        sockets[int(target[8:-1])] = (pid, comm)
+                    except ValueError:
+                        continue
         except (PermissionError, FileNotFoundError, ProcessLookupError):
-            continue
+            pass
+        finally:
+            os.close(dir_fd)
+        return sockets
+
+
+def _get_scan_pool() -> ThreadPoolExecutor:
+    """Shared pool for fd scans; the GIL is released during the syscalls."""
+    global _scan_pool
+    if _scan_pool is None:
+        _scan_pool = ThreadPoolExecutor(
+            max_workers=min(16, (os.cpu_count() or 1) * 2),
+            thread_name_prefix="nethergaze-fdscan",
+        )
+    return _scan_pool
+
+
+def _read_small(path: str, size: int = 1024) -> bytes | None:
+    """Read up to ``size`` bytes of a small /proc file without Path overhead."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except (PermissionError, FileNotFoundError, ProcessLookupError):
+        return None
+    try:
+        return os.read(fd, size)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
 
-    return inode_map
+_default_inode_cache = InodePidCache()
@@ -2,16 +2,39 @@
 
 from __future__ import annotations
 
+import fnmatch
 import glob as _glob
 import json as _json
+import math
 import os
 import re
-from datetime import datetime
+import struct
+import sys
+from collections import deque
+from datetime import datetime, timedelta, timezone
 from enum import Enum
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
 
 from nethergaze.models import LogEntry
 
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import ctypes
+
+    _libc = ctypes.CDLL(None, use_errno=True)
+    _libc.inotify_init1  # noqa: B018 — raises AttributeError off Linux
+    HAS_INOTIFY = True
+except (ImportError, OSError, AttributeError):
+    HAS_INOTIFY = False
+
 
 class LogFormat(Enum):
     """Supported log format types."""
@@ -22,8 +45,9 @@ class LogFormat(Enum):
     JSON = "json"
 
 
-# Combined log format regex (nginx combined / Apache combined — CLF-derived)
-_COMBINED_PATTERN = re.compile(
+# Shared CLF prefix: everything up to and including the bytes field.
+# All patterns use re.ASCII so \S, \s and \d skip Unicode category lookups.
+_CLF_PREFIX = (
     r"(?P<remote_ip>\S+)\s+"  # client IP
     r"\S+\s+"  # ident (always -)
     r"\S+\s+"  # auth user
@@ -32,44 +56,199 @@ _COMBINED_PATTERN = re.compile(
     r"(?P<path>\S+)\s+"  # /path
     r'(?P<protocol>[^"]+)"\s+'  # HTTP/1.1"
     r"(?P<status>\d{3})\s+"  # status code
-    r"(?P<bytes>\d+|-)\s+"  # bytes sent
-    r'"(?P<referrer>[^"]*)"\s+'  # "referrer"
-    r'"(?P<user_agent>[^"]*)"'  # "user agent"
+    r"(?P<bytes>\d+|-)"  # bytes sent
+)
+_REFERRER_UA = (
+    r'\s+"(?P<referrer>[^"]*)"'  # "referrer"
+    r'\s+"(?P<user_agent>[^"]*)"'  # "user agent"
 )
 
+# Combined log format regex (nginx combined / Apache combined — CLF-derived).
+_COMBINED_PATTERN = re.compile(_CLF_PREFIX + _REFERRER_UA, re.ASCII)
+
 # Common log format regex (same as combined but ends after bytes — no referrer/user-agent)
-_COMMON_PATTERN = re.compile(
-    r"(?P<remote_ip>\S+)\s+"  # client IP
-    r"\S+\s+"  # ident (always -)
-    r"\S+\s+"  # auth user
-    r"\[(?P<timestamp>[^\]]+)\]\s+"  # [timestamp]
-    r'"(?P<method>\S+)\s+'  # "METHOD
-    r"(?P<path>\S+)\s+"  # /path
-    r'(?P<protocol>[^"]+)"\s+'  # HTTP/1.1"
-    r"(?P<status>\d{3})\s+"  # status code
-    r"(?P<bytes>\d+|-)\s*$"  # bytes sent (end of line)
+_COMMON_PATTERN = re.compile(_CLF_PREFIX + r"\s*$", re.ASCII)
+
+# AUTO: one match call covers both — referrer/user_agent are None on CLF lines
+_AUTO_CLF_PATTERN = re.compile(
+    _CLF_PREFIX + r"(?:" + _REFERRER_UA + r"|\s*$)", re.ASCII
 )
 
 _TIMESTAMP_FORMAT = "%d/%b/%Y:%H:%M:%S %z"
 
+_by_timestamp = attrgetter("timestamp")
+
+_MONTHS = {
+    m: i
+    for i, m in enumerate(
+        (
+            "Jan",
+            "Feb",
+            "Mar",
+            "Apr",
+            "May",
+            "Jun",
+            "Jul",
+            "Aug",
+            "Sep",
+            "Oct",
+            "Nov",
+            "Dec",
+        ),
+        start=1,
+    )
+}
+
+# orjson decodes JSON log lines ~3x faster; its errors subclass ValueError
+_json_loads = orjson.loads if HAS_ORJSON else _json.loads
+
+# Bytes read from a log per os.read() call
+_READ_CHUNK = 1 << 20
+
+# inotify event bits (linux/inotify.h)
+_IN_MODIFY = 0x2
+_IN_ATTRIB = 0x4
+_IN_MOVED_FROM = 0x40
+_IN_MOVED_TO = 0x80
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_MOVE_SELF = 0x800
+_IN_Q_OVERFLOW = 0x4000
+_IN_IGNORED = 0x8000
+_IN_DIR_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+)
+# Events that mean the set of files in a directory changed
+_IN_DIR_CHANGE = _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+# Events after which the watch can no longer be trusted
+_IN_UNRELIABLE = _IN_Q_OVERFLOW | _IN_IGNORED | _IN_DELETE_SELF | _IN_MOVE_SELF
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Minimal non-blocking inotify handle watching directories (Linux only)."""
+
+    def __init__(self):
+        fd = _libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self.fd = fd
+
+    def add_watch(self, path: str, mask: int = _IN_DIR_MASK) -> int:
+        wd = _libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def read(self) -> list[tuple[int, str]] | None:
+        """Drain pending events as (mask, name) pairs.
+
+        Returns None if the queue overflowed or a watched directory went away,
+        in which case the caller should fall back to polling.
+        """
+        events: list[tuple[int, str]] = []
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                _wd, mask, _cookie, length = _INOTIFY_EVENT.unpack_from(data, offset)
+                offset += _INOTIFY_EVENT.size
+                if mask & _IN_UNRELIABLE:
+                    return None
+                name = data[offset : offset + length].rstrip(b"\0")
+                events.append((mask, os.fsdecode(name)))
+                offset += length
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def _open_dir_watch(directory: str) -> _Inotify | None:
+    """Watch a directory with inotify, or return None to fall back to polling."""
+    if not HAS_INOTIFY:
+        return None
+    try:
+        notify = _Inotify()
+    except OSError:
+        return None
+    try:
+        notify.add_watch(directory)
+    except OSError:
+        notify.close()
+        return None
+    return notify
+
 
 class LogWatcher:
-    """Tails HTTP server access log, detects rotation, yields new entries."""
+    """Tails HTTP server access log, detects rotation, yields new entries.
+
+    On Linux the log's directory is watched with inotify, so polls while the
+    file is idle return without touching it; elsewhere every poll stats it.
+    """
 
     def __init__(
-        self, log_path: str, max_entries_per_ip: int = 100, log_format: str = "auto"
+        self,
+        log_path: str,
+        max_entries_per_ip: int = 100,
+        log_format: str = "auto",
+        watch: bool = True,
+        keep_raw_line: bool = False,
     ):
         self.log_path = Path(log_path)
         self.max_entries_per_ip = max_entries_per_ip
         self.log_format = LogFormat(log_format)
-        self._file = None
+        self.keep_raw_line = keep_raw_line
+        self._detected_format: LogFormat | None = None
+        self._fd: int | None = None
+        self._tail = b""
         self._inode: int | None = None
         self._position: int = 0
         self._first_open: bool = True
-        self._ip_buffers: dict[str, list[LogEntry]] = {}
+        self._ip_buffers: dict[str, deque[LogEntry]] = {}
+        # Writes to a symlink's target raise no events under the link's name,
+        # so symlinked logs are always stat-polled
+        self._is_symlink = self.log_path.is_symlink()
+        # watch=False when a MultiLogWatcher already watches the directory
+        self._notify = (
+            _open_dir_watch(str(self.log_path.parent))
+            if watch and not self._is_symlink
+            else None
+        )
+
+    def _has_changed(self) -> bool:
+        """Drain inotify events; False only if the open log is known idle."""
+        if self._notify is None:
+            return True
+        events = self._notify.read()
+        if events is None:
+            # Lost track of events — degrade to plain polling
+            self._notify.close()
+            self._notify = None
+            return True
+        if self._fd is None:
+            return True
+        name = self.log_path.name
+        return any(event_name == name for _mask, event_name in events)
 
     def poll(self) -> list[LogEntry]:
         """Poll for new log lines. Returns newly parsed entries."""
+        if not self._has_changed():
+            return []
         if not self.log_path.exists():
             return []
 
@@ -89,56 +268,102 @@ class LogWatcher:
             self._close()
             self._position = 0
 
-        if self._file is None:
+        if self._fd is None:
             try:
-                self._file = open(self.log_path, "r", errors="replace")
-                self._inode = current_inode
-                # Seek to end on first open (only tail new lines)
-                if self._first_open:
-                    self._file.seek(0, os.SEEK_END)
-                    self._position = self._file.tell()
-                    self._first_open = False
-                else:
-                    self._file.seek(self._position)
+                self._fd = os.open(self.log_path, os.O_RDONLY | os.O_CLOEXEC)
             except (PermissionError, FileNotFoundError):
                 return []
+            self._inode = current_inode
+            # Seek to end on first open (only tail new lines)
+            if self._first_open:
+                self._position = os.lseek(self._fd, 0, os.SEEK_END)
+                self._first_open = False
+            else:
+                os.lseek(self._fd, self._position, os.SEEK_SET)
 
         new_entries: list[LogEntry] = []
-        for line in self._file:
-            line = line.rstrip("\n")
+        while True:
+            data = os.read(self._fd, _READ_CHUNK)
+            if not data:
+                break
+            self._position += len(data)
+            self._consume(data, new_entries)
+            if len(data) < _READ_CHUNK:
+                break
+        return new_entries
+
+    def _consume(self, data: bytes, new_entries: list[LogEntry]) -> None:
+        """Parse the complete lines in ``data``; keep any partial last line."""
+        end = data.rfind(b"\n")
+        if end < 0:
+            self._tail += data
+            return
+        if self._tail:
+            data = self._tail + data
+            end += len(self._tail)
+        self._tail = data[end + 1 :]
+        # Decode all complete lines at once rather than line by line
+        text = data[:end].decode("utf-8", errors="replace")
+        if "\r" in text:
+            text = text.replace("\r\n", "\n")
+
+        # Hot loop: bind everything it touches to locals, and call the fixed
+        # or last detected format's parser directly
+        max_entries = self.max_entries_per_ip
+        ip_buffers = self._ip_buffers
+        get_buf = ip_buffers.get
+        append = new_entries.append
+        keep_raw = self.keep_raw_line
+        fixed = _PARSERS.get(self.log_format)
+        detected = _PARSERS.get(self._detected_format)
+        for line in text.split("\n"):
             if not line:
                 continue
-            entry = parse_log_line(line, self.log_format)
+            if fixed is not None:
+                entry = fixed(line)
+            else:
+                entry = detected(line) if detected is not None else None
+                if entry is None:
+                    entry, fmt = _parse_auto(line)
+                    if fmt is not None:
+                        self._detected_format = fmt
+                        detected = _PARSERS[fmt]
             if entry:
-                new_entries.append(entry)
-                # Maintain per-IP buffer
-                buf = self._ip_buffers.setdefault(entry.remote_ip, [])
+                if not keep_raw:
+                    entry.raw_line = ""
+                append(entry)
+                # Maintain per-IP buffer; the deque evicts the oldest entry
+                buf = get_buf(entry.remote_ip)
+                if buf is None:
+                    buf = ip_buffers[entry.remote_ip] = deque(maxlen=max_entries)
                 buf.append(entry)
-                if len(buf) > self.max_entries_per_ip:
-                    self._ip_buffers[entry.remote_ip] = buf[-self.max_entries_per_ip :]
-
-        self._position = self._file.tell()
-        return new_entries
 
     def get_entries_for_ip(self, ip: str) -> list[LogEntry]:
         """Get buffered log entries for a specific IP."""
-        return list(self._ip_buffers.get(ip, []))
+        return list(self._ip_buffers.get(ip, ()))
 
     def _close(self) -> None:
-        if self._file:
-            self._file.close()
-            self._file = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
             self._inode = None
+        self._tail = b""
 
     def close(self) -> None:
         """Clean shutdown."""
         self._close()
+        if self._notify is not None:
+            self._notify.close()
+            self._notify = None
 
 
 class MultiLogWatcher:
     """Watches multiple log files, expanding glob patterns.
 
     Periodically re-expands the glob to pick up new files (e.g. after vhost addition).
+    When the glob's directory is literal, one inotify watch on it serves every
+    file: new or removed files are picked up on the next poll, and only files
+    with pending events are read.
     Presents the same interface as LogWatcher (poll / close).
     """
 
@@ -147,14 +372,46 @@ class MultiLogWatcher:
         log_path_pattern: str,
         max_entries_per_ip: int = 100,
         log_format: str = "auto",
+        keep_raw_line: bool = False,
     ):
         self._pattern = log_path_pattern
         self._max_entries_per_ip = max_entries_per_ip
         self._log_format = log_format
+        self._keep_raw_line = keep_raw_line
         self._watchers: dict[str, LogWatcher] = {}
-        self._ip_buffers: dict[str, list[LogEntry]] = {}
+        self._ip_buffers: dict[str, deque[LogEntry]] = {}
+        pattern_dir, self._name_pattern = os.path.split(log_path_pattern)
+        self._notify = (
+            None
+            if _glob.has_magic(pattern_dir)
+            else _open_dir_watch(pattern_dir or ".")
+        )
         self._rescan()
 
+    def _check_dir_events(self) -> set[str] | None:
+        """Drain directory events; rescan if a matching file appeared or vanished.
+
+        Returns the names of files with pending events, or None if every
+        watcher has to be polled.
+        """
+        if self._notify is None:
+            return None
+        events = self._notify.read()
+        if events is None:
+            self._notify.close()
+            self._notify = None
+            self._rescan()
+            return None
+        changed: set[str] = set()
+        rescan = False
+        for mask, name in events:
+            if fnmatch.fnmatch(name, self._name_pattern):
+                changed.add(name)
+                rescan = rescan or bool(mask & _IN_DIR_CHANGE)
+        if rescan:
+            self._rescan()
+        return changed
+
     def _rescan(self) -> None:
         """Expand glob and create watchers for any new files.
 
@@ -168,7 +425,11 @@ class MultiLogWatcher:
                     p,
                     max_entries_per_ip=self._max_entries_per_ip,
                     log_format=self._log_format,
+                    watch=self._notify is None,
+                    keep_raw_line=self._keep_raw_line,
                 )
+                # Children append straight into the merged per-IP buffers
+                self._watchers[p]._ip_buffers = self._ip_buffers
         # Remove watchers for deleted files
         for p in list(self._watchers):
             if p not in paths:
@@ -177,19 +438,25 @@ class MultiLogWatcher:
 
     def poll(self) -> list[LogEntry]:
         """Poll all watched log files and return combined new entries."""
+        changed = self._check_dir_events()
         all_entries: list[LogEntry] = []
-        for watcher in list(self._watchers.values()):
-            all_entries.extend(watcher.poll())
-        # Merge per-IP buffers from all watchers
-        self._ip_buffers.clear()
-        for watcher in self._watchers.values():
-            for ip, entries in watcher._ip_buffers.items():
-                buf = self._ip_buffers.setdefault(ip, [])
-                buf.extend(entries)
-                if len(buf) > self._max_entries_per_ip:
-                    self._ip_buffers[ip] = buf[-self._max_entries_per_ip :]
-        # Sort combined entries by timestamp
-        all_entries.sort(key=lambda e: e.timestamp)
+        sources = 0
+        for path, watcher in list(self._watchers.items()):
+            # Unopened watchers still need their first poll to find the EOF
+            if (
+                changed is None
+                or watcher._fd is None
+                or watcher._is_symlink
+                or os.path.basename(path) in changed
+            ):
+                entries = watcher.poll()
+                if entries:
+                    all_entries.extend(entries)
+                    sources += 1
+        # Interleave files by timestamp. Timsort merges the per-file runs
+        # itself, faster than heapq.merge's Python-level generator.
+        if sources > 1:
+            all_entries.sort(key=_by_timestamp)
         return all_entries
 
     def rescan(self) -> None:
@@ -198,13 +465,16 @@ class MultiLogWatcher:
 
     def get_entries_for_ip(self, ip: str) -> list[LogEntry]:
         """Get buffered log entries for a specific IP across all files."""
-        return list(self._ip_buffers.get(ip, []))
+        return list(self._ip_buffers.get(ip, ()))
 
     def close(self) -> None:
         """Clean shutdown of all watchers."""
         for watcher in self._watchers.values():
             watcher.close()
         self._watchers.clear()
+        if self._notify is not None:
+            self._notify.close()
+            self._notify = None
 
 
 def parse_log_line(
@@ -215,21 +485,34 @@ def parse_log_line(
     Supports combined (nginx/Apache), common (CLF), and JSON (Caddy-style) formats.
     In AUTO mode, tries combined -> common -> JSON in order.
     """
-    if log_format == LogFormat.COMBINED:
-        return _parse_combined(line)
-    elif log_format == LogFormat.COMMON:
-        return _parse_common(line)
-    elif log_format == LogFormat.JSON:
-        return _parse_json_line(line)
-    else:
-        # AUTO: try combined first (preserves backward compat), then common, then JSON
-        entry = _parse_combined(line)
+    parse = _PARSERS.get(log_format)
+    if parse is not None:
+        return parse(line)
+    return _parse_auto(line)[0]
+
+
+def _parse_auto(line: str) -> tuple[LogEntry | None, LogFormat | None]:
+    """AUTO detection; also returns which format matched.
+
+    Tries combined first (preserves backward compat), then common, then JSON;
+    combined and common share one regex match call. JSON is tried first for
+    lines starting with '{'.
+    """
+    if line[:1] == "{":
+        entry = _parse_json_line(line)
         if entry:
-            return entry
-        entry = _parse_common(line)
+            return entry, LogFormat.JSON
+    match = _AUTO_CLF_PATTERN.match(line)
+    if match:
+        groups = match.groups()
+        if groups[-1] is not None:
+            return _build_entry(*groups, line), LogFormat.COMBINED
+        return _build_entry(*groups[:-2], "", "", line), LogFormat.COMMON
+    if line[:1] != "{":
+        entry = _parse_json_line(line)
         if entry:
-            return entry
-        return _parse_json_line(line)
+            return entry, LogFormat.JSON
+    return None, None
 
 
 def _parse_combined(line: str) -> LogEntry | None:
@@ -237,26 +520,82 @@ def _parse_combined(line: str) -> LogEntry | None:
     match = _COMBINED_PATTERN.match(line)
     if not match:
         return None
+    return _build_entry(*match.groups(), line)
+
+
+@lru_cache(maxsize=64)
+def _clf_tz(offset: str) -> timezone:
+    """Build the tzinfo for a ±HHMM offset; a log rarely has more than one."""
+    minutes = int(offset[1:3]) * 60 + int(offset[3:5])
+    if offset[0] == "-":
+        minutes = -minutes
+    elif offset[0] != "+":
+        raise ValueError(f"bad UTC offset: {offset!r}")
+    return timezone(timedelta(minutes=minutes))
+
+
+@lru_cache(maxsize=4096)
+def _parse_clf_ts(timestamp_str: str) -> datetime:
+    """Parse a CLF timestamp; busy logs repeat each second across many lines."""
+    s = timestamp_str
+    # Fixed layout "DD/Mon/YYYY:HH:MM:SS ±ZZZZ" — slice it instead of strptime
+    month = _MONTHS.get(s[3:6])
+    if (
+        month is None
+        or len(s) != 26
+        or s[2] != "/"
+        or s[6] != "/"
+        or s[11] != ":"
+        or s[14] != ":"
+        or s[17] != ":"
+        or s[20] != " "
+        or not (s[0:2] + s[7:11] + s[12:14] + s[15:17] + s[18:20]).isdigit()
+    ):
+        return datetime.strptime(s, _TIMESTAMP_FORMAT)
+    return datetime(
+        int(s[7:11]),
+        month,
+        int(s[0:2]),
+        int(s[12:14]),
+        int(s[15:17]),
+        int(s[18:20]),
+        tzinfo=_clf_tz(s[21:]),
+    )
 
+
+def _build_entry(
+    remote_ip: str,
+    timestamp_str: str,
+    method: str,
+    path: str,
+    protocol: str,
+    status: str,
+    bytes_str: str,
+    referrer: str,
+    user_agent: str,
+    line: str,
+) -> LogEntry:
+    """Build a LogEntry from a match's groups, in pattern order."""
     try:
-        timestamp = datetime.strptime(match.group("timestamp"), _TIMESTAMP_FORMAT)
+        timestamp = _parse_clf_ts(timestamp_str)
     except ValueError:
         timestamp = datetime.now().astimezone()
 
-    bytes_str = match.group("bytes")
-    bytes_sent = int(bytes_str) if bytes_str != "-" else 0
-
+    # Buffered entries repeat a handful of IPs, methods, protocols and
+    # user agents; interning shares one string object per distinct value.
+    # Positional arguments (LogEntry field order) halve the __init__ cost.
+    _intern = sys.intern
     return LogEntry(
-        remote_ip=match.group("remote_ip"),
-        timestamp=timestamp,
-        method=match.group("method"),
-        path=match.group("path"),
-        protocol=match.group("protocol"),
-        status_code=int(match.group("status")),
-        bytes_sent=bytes_sent,
-        referrer=match.group("referrer"),
-        user_agent=match.group("user_agent"),
-        raw_line=line,
+        _intern(remote_ip),
+        timestamp,
+        _intern(method),
+        path,
+        _intern(protocol),
+        int(status),
+        int(bytes_str) if bytes_str != "-" else 0,
+        referrer,
+        _intern(user_agent),
+        line,
     )
 
 
@@ -265,34 +604,14 @@ def _parse_common(line: str) -> LogEntry | None:
     match = _COMMON_PATTERN.match(line)
     if not match:
         return None
-
-    try:
-        timestamp = datetime.strptime(match.group("timestamp"), _TIMESTAMP_FORMAT)
-    except ValueError:
-        timestamp = datetime.now().astimezone()
-
-    bytes_str = match.group("bytes")
-    bytes_sent = int(bytes_str) if bytes_str != "-" else 0
-
-    return LogEntry(
-        remote_ip=match.group("remote_ip"),
-        timestamp=timestamp,
-        method=match.group("method"),
-        path=match.group("path"),
-        protocol=match.group("protocol"),
-        status_code=int(match.group("status")),
-        bytes_sent=bytes_sent,
-        referrer="",
-        user_agent="",
-        raw_line=line,
-    )
+    return _build_entry(*match.groups(), "", "", line)
 
 
 def _parse_json_line(line: str) -> LogEntry | None:
     """Parse a JSON-formatted log line (Caddy-style nested or flat key format)."""
     try:
-        data = _json.loads(line)
-    except (ValueError, _json.JSONDecodeError):
+        data = _json_loads(line)
+    except ValueError:
         return None
 
     if not isinstance(data, dict):
@@ -348,31 +667,73 @@ def _parse_json_line(line: str) -> LogEntry | None:
 
     # Timestamp
     ts_str = data.get("ts") or data.get("timestamp") or data.get("time")
-    timestamp = datetime.now().astimezone()
-    if isinstance(ts_str, (int, float)):
-        try:
-            timestamp = datetime.fromtimestamp(ts_str).astimezone()
-        except (OSError, ValueError):
-            pass
-    elif isinstance(ts_str, str):
-        for fmt in ("%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%dT%H:%M:%SZ", _TIMESTAMP_FORMAT):
-            try:
-                timestamp = datetime.strptime(ts_str, fmt)
-                if timestamp.tzinfo is None:
-                    timestamp = timestamp.astimezone()
-                break
-            except ValueError:
-                continue
+    timestamp = _json_timestamp(ts_str)
 
     return LogEntry(
-        remote_ip=remote_ip,
-        timestamp=timestamp,
-        method=method,
-        path=path,
-        protocol=protocol,
-        status_code=int(status),
-        bytes_sent=int(size),
-        referrer=referrer,
-        user_agent=user_agent,
-        raw_line=line,
+        sys.intern(remote_ip),
+        timestamp,
+        method,
+        path,
+        protocol,
+        int(status),
+        int(size),
+        referrer,
+        user_agent,
+        line,
     )
+
+
+def _json_timestamp(value: object) -> datetime:
+    """Convert a JSON log timestamp (epoch number or string) to local time.
+
+    A file uses one timestamp shape throughout and busy logs repeat each
+    second, so both shapes resolve through per-second caches.
+    """
+    if isinstance(value, (int, float)):
+        try:
+            return _epoch_timestamp(value)
+        except (OSError, ValueError, OverflowError):
+            pass
+    elif isinstance(value, str):
+        try:
+            return _parse_json_ts_str(value)
+        except ValueError:
+            pass
+    return datetime.now().astimezone()
+
+
+def _epoch_timestamp(value: float) -> datetime:
+    """datetime.fromtimestamp(value).astimezone(), via a per-second cache."""
+    sec = math.floor(value)
+    micros = round((value - sec) * 1_000_000)
+    if micros >= 1_000_000:
+        return _local_second(sec + 1)
+    base = _local_second(sec)
+    return base.replace(microsecond=micros) if micros else base
+
+
+@lru_cache(maxsize=1024)
+def _local_second(sec: int) -> datetime:
+    return datetime.fromtimestamp(sec).astimezone()
+
+
+@lru_cache(maxsize=4096)
+def _parse_json_ts_str(ts_str: str) -> datetime:
+    """Parse a string JSON timestamp: ISO 8601, else the CLF layout."""
+    # fromisoformat is C and ~50x faster than strptime; it also takes the
+    # "Z" suffix and fractional seconds
+    try:
+        timestamp = datetime.fromisoformat(ts_str)
+    except ValueError:
+        return _parse_clf_ts(ts_str)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.astimezone()
+    return timestamp
+
+
+# Parser for each fixed format; AUTO goes through _parse_auto
+_PARSERS = {
+    LogFormat.COMBINED: _parse_combined,
+    LogFormat.COMMON: _parse_common,
+    LogFormat.JSON: _parse_json_line,
+}
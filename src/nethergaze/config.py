@@ -15,6 +15,8 @@ class AppConfig:
     # HTTP server access log path (supports glob patterns, e.g. /var/log/nginx/*.access.log)
     log_path: str = "/var/log/nginx/*.access.log"
     log_format: str = "auto"
+    # Keep each entry's original line in memory (roughly doubles log buffers)
+    keep_raw_line: bool = False
 
     # Refresh intervals (seconds)
     connections_interval: float = 1.0
@@ -38,6 +40,8 @@ class AppConfig:
     max_log_lines: int = 500
     max_log_entries_per_ip: int = 100
     show_private_ips: bool = False
+    # Cap on IP profiles kept in memory; least recently active are evicted
+    max_tracked_ips: int = 50_000
 
     # Filters
     cidr_allow: list[str] = field(default_factory=list)
@@ -103,7 +107,13 @@ def _resolve_config_path(explicit_path: str | None) -> Path | None:
 def _apply_toml(config: AppConfig, data: dict) -> None:
     """Apply TOML data to config."""
     section_map = {
-        "log": ["log_path", "log_format", "max_log_lines", "max_log_entries_per_ip"],
+        "log": [
+            "log_path",
+            "log_format",
+            "max_log_lines",
+            "max_log_entries_per_ip",
+            "keep_raw_line",
+        ],
         "refresh": ["connections_interval", "log_interval", "bandwidth_interval"],
         "geoip": ["geoip_enabled", "geoip_city_db", "geoip_asn_db"],
         "whois": ["whois_enabled", "whois_cache_ttl", "whois_max_workers"],
@@ -134,6 +144,7 @@ def _apply_toml(config: AppConfig, data: dict) -> None:
         "log_format",
         "interface",
         "show_private_ips",
+        "max_tracked_ips",
     ):
         if key in data:
             setattr(config, key, data[key])
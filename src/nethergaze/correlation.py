@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import heapq
 import threading
 import time
-from datetime import datetime
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+from operator import itemgetter
 
+from nethergaze.filters import profile_filter_text
 from nethergaze.models import (
     AggregateStats,
     BandwidthStats,
@@ -18,113 +22,269 @@ from nethergaze.models import (
     WhoisInfo,
 )
 
+_NO_STATES: frozenset[TCPState] = frozenset()
+
+
+def _trim_window(timestamps: deque[float], cutoff: float) -> None:
+    """Drop timestamps at or before cutoff from the front of a window."""
+    while timestamps and timestamps[0] <= cutoff:
+        timestamps.popleft()
+
 
 class CorrelationEngine:
     """Thread-safe engine that correlates all data sources into IPProfile records."""
 
-    def __init__(self):
+    def __init__(self, max_profiles: int = 50_000):
         self._lock = threading.Lock()
-        self._profiles: dict[str, IPProfile] = {}
+        # Least recently updated first; bounded so scans cannot grow it forever
+        self._profiles: OrderedDict[str, IPProfile] = OrderedDict()
+        self._max_profiles = max_profiles
         self._bandwidth: BandwidthStats | None = None
-        self._request_timestamps: list[float] = []
-        self._ip_request_timestamps: dict[str, list[float]] = {}
-        self._new_conn_timestamps: list[float] = []
+        # Append-only, monotonic windows: trimming drops a prefix
+        # Requests per second over the last minute, indexed by second % 60
+        self._rpm_buckets: list[int] = [0] * 60
+        self._rpm_second = 0
+        self._ip_request_timestamps: dict[str, deque[float]] = {}
+        self._new_conn_timestamps: deque[float] = deque()
         self._known_conn_ips: set[str] = set()
+        # IPs whose profiles currently hold connections from the last poll
+        self._connected_ips: set[str] = set()
+        # Trim candidates among profiles without connections: a lazy min-heap
+        # of (last_seen, ip) for those with requests (entries go stale when
+        # last_seen moves), and a set of those without any requests
+        self._expiry_heap: list[tuple[datetime, str]] = []
+        self._idle_ips: set[str] = set()
+        # Running totals kept by the update methods for get_aggregate_stats
+        self._total_conns = 0
+        self._established = 0
+        self._total_requests = 0
+        self._total_bytes = 0
+        # Bumped on every change a dashboard refresh could show
+        self._version = 0
+        # Active profiles in display order; None until rebuilt after an update
+        self._snapshot: tuple[IPProfile, ...] | None = None
 
     def update_connections(self, connections: list[Connection]) -> None:
         """Update connection data. Replaces all connection lists per IP."""
         by_ip: dict[str, list[Connection]] = {}
+        established = 0
         for conn in connections:
             by_ip.setdefault(conn.remote_ip, []).append(conn)
+            if conn.state == TCPState.ESTABLISHED:
+                established += 1
 
-        now = time.time()
+        now = time.monotonic()
+        seen = datetime.now().astimezone()
         with self._lock:
-            # Clear old connections from all profiles
-            for profile in self._profiles.values():
-                profile.connections = []
+            # Clear old connections from the profiles that had any
+            for ip in self._connected_ips:
+                profile = self._profiles.get(ip)
+                if profile is not None:
+                    profile.connections = []
+                    profile._conn_states = _NO_STATES
+                    profile._rev += 1
+            disconnected = self._connected_ips.difference(by_ip)
+            self._connected_ips = set(by_ip)
+            self._total_conns = len(connections)
+            self._established = established
+            self._snapshot = None
+            self._version += 1
 
             # Apply new connections, track new IPs
             for ip, conns in by_ip.items():
-                profile = self._profiles.setdefault(ip, IPProfile(ip=ip))
+                profile = self._touch(ip)
                 profile.connections = conns
-                ts = datetime.now().astimezone()
+                profile._conn_states = frozenset(c.state for c in conns)
+                profile._rev += 1
                 if profile.first_seen is None:
-                    profile.first_seen = ts
-                profile.last_seen = ts
+                    profile.first_seen = seen
+                profile.last_seen = seen
 
                 if ip not in self._known_conn_ips:
                     self._known_conn_ips.add(ip)
                     self._new_conn_timestamps.append(now)
 
+            for ip in disconnected:
+                profile = self._profiles.get(ip)
+                if profile is not None:
+                    self._mark_trimmable(profile)
+
             # Trim new-conn timestamps older than 60s
-            cutoff = now - 60
-            self._new_conn_timestamps = [
-                t for t in self._new_conn_timestamps if t > cutoff
+            _trim_window(self._new_conn_timestamps, now - 60)
+
+    def _touch(self, ip: str) -> IPProfile:
+        """Get or create the profile for ip and mark it most recently used.
+
+        Caller must hold the lock.
+        """
+        profile = self._profiles.get(ip)
+        if profile is not None:
+            self._profiles.move_to_end(ip)
+            return profile
+        if len(self._profiles) >= self._max_profiles:
+            self._drop(next(iter(self._profiles)))
+        profile = self._profiles[ip] = IPProfile(ip=ip)
+        profile._conn_states = _NO_STATES
+        profile._filter_text = profile_filter_text(profile)
+        profile._rev = 0
+        self._idle_ips.add(ip)
+        return profile
+
+    def _mark_trimmable(self, profile: IPProfile) -> None:
+        """Queue a profile without connections for trim_stale_profiles (lock held)."""
+        if profile.connections:
+            return
+        if profile.total_requests == 0:
+            self._idle_ips.add(profile.ip)
+        elif profile.last_seen is not None:
+            heapq.heappush(self._expiry_heap, (profile.last_seen, profile.ip))
+
+    def _drop(self, ip: str) -> None:
+        """Remove a profile and its share of the running totals (lock held)."""
+        profile = self._profiles.pop(ip)
+        self._total_requests -= profile.total_requests
+        self._total_bytes -= profile.total_bytes_sent
+        if profile.connections:
+            self._total_conns -= len(profile.connections)
+            self._established -= profile.active_connections
+        self._ip_request_timestamps.pop(ip, None)
+        self._known_conn_ips.discard(ip)
+        self._connected_ips.discard(ip)
+        self._idle_ips.discard(ip)
+        self._snapshot = None
+        self._version += 1
+
+    def _advance_rpm(self, now: float) -> None:
+        """Zero the request buckets for seconds that left the window (lock held)."""
+        second = int(now)
+        elapsed = second - self._rpm_second
+        if elapsed <= 0:
+            return
+        buckets = self._rpm_buckets
+        for s in range(second - min(elapsed, 60) + 1, second + 1):
+            buckets[s % 60] = 0
+        self._rpm_second = second
+
+    def _active_profiles(self) -> tuple[IPProfile, ...]:
+        """Profiles with activity, sorted for display (lock held).
+
+        Rebuilt at most once per update, so readers between updates only
+        take the lock long enough to grab the published tuple.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            profiles = [
+                p
+                for p in self._profiles.values()
+                if p.connections or p.total_requests > 0
             ]
+            # Compute per-IP request rates
+            for p in profiles:
+                rate = float(len(self._ip_request_timestamps.get(p.ip, ())))
+                if rate != p.request_rate_per_min:
+                    p.request_rate_per_min = rate
+                    p._rev += 1
+            profiles.sort(
+                key=lambda p: (p.active_connections, p.total_requests), reverse=True
+            )
+            snapshot = self._snapshot = tuple(profiles)
+        return snapshot
 
     def update_log_entries(self, entries: list[LogEntry]) -> None:
         """Add new log entries to the appropriate IP profiles."""
-        now = time.time()
+        # Group the batch first so each profile is touched once per poll
+        by_ip: dict[str, list[LogEntry]] = {}
+        for entry in entries:
+            batch = by_ip.get(entry.remote_ip)
+            if batch is None:
+                by_ip[entry.remote_ip] = [entry]
+            else:
+                batch.append(entry)
+
+        now = time.monotonic()
         with self._lock:
-            for entry in entries:
-                ip = entry.remote_ip
-                profile = self._profiles.setdefault(ip, IPProfile(ip=ip))
-                profile.log_entries.append(entry)
-                profile.total_requests += 1
-                profile.total_bytes_sent += entry.bytes_sent
+            for ip, batch in by_ip.items():
+                profile = self._touch(ip)
+                profile.log_entries.extend(batch)
+                profile.total_requests += len(batch)
+                batch_bytes = sum(e.bytes_sent for e in batch)
+                profile.total_bytes_sent += batch_bytes
+                self._total_bytes += batch_bytes
                 if profile.first_seen is None:
-                    profile.first_seen = entry.timestamp
-                profile.last_seen = entry.timestamp
-                self._request_timestamps.append(now)
+                    profile.first_seen = batch[0].timestamp
+                profile.last_seen = batch[-1].timestamp
+                profile._rev += 1
+                self._mark_trimmable(profile)
 
                 # Per-IP timestamps
-                ip_ts = self._ip_request_timestamps.setdefault(ip, [])
-                ip_ts.append(now)
+                ip_ts = self._ip_request_timestamps.get(ip)
+                if ip_ts is None:
+                    ip_ts = self._ip_request_timestamps[ip] = deque()
+                ip_ts.extend([now] * len(batch))
+            self._advance_rpm(now)
+            self._rpm_buckets[int(now) % 60] += len(entries)
+            self._snapshot = None
+            self._version += 1
+            self._total_requests += len(entries)
 
             # Trim timestamps older than 60 seconds
             cutoff = now - 60
-            self._request_timestamps = [
-                t for t in self._request_timestamps if t > cutoff
-            ]
             for ip in list(self._ip_request_timestamps):
                 ts_list = self._ip_request_timestamps[ip]
-                ts_list[:] = [t for t in ts_list if t > cutoff]
+                _trim_window(ts_list, cutoff)
                 if not ts_list:
                     del self._ip_request_timestamps[ip]
 
     def update_geo(self, ip: str, geo: GeoInfo) -> None:
         """Update GeoIP data for an IP."""
         with self._lock:
-            profile = self._profiles.setdefault(ip, IPProfile(ip=ip))
+            profile = self._touch(ip)
             profile.geo = geo
+            profile._filter_text = profile_filter_text(profile)
+            profile._rev += 1
+            self._version += 1
+
+    def update_geos(self, geos: dict[str, GeoInfo]) -> None:
+        """Update GeoIP data for a batch of IPs under one lock acquisition."""
+        with self._lock:
+            for ip, geo in geos.items():
+                profile = self._touch(ip)
+                profile.geo = geo
+                profile._filter_text = profile_filter_text(profile)
+                profile._rev += 1
+            self._version += 1
 
     def update_whois(self, ip: str, whois: WhoisInfo) -> None:
         """Update whois data for an IP."""
         with self._lock:
-            profile = self._profiles.setdefault(ip, IPProfile(ip=ip))
+            profile = self._touch(ip)
             profile.whois = whois
+            profile._filter_text = profile_filter_text(profile)
+            profile._rev += 1
+            self._version += 1
 
     def update_bandwidth(self, stats: BandwidthStats) -> None:
         """Update bandwidth statistics."""
-        with self._lock:
-            self._bandwidth = stats
+        # A single reference swap; readers never see a partial update
+        self._bandwidth = stats
 
-    def get_profiles(self) -> list[IPProfile]:
-        """Get IP profiles with activity, with computed per-IP request rates."""
-        with self._lock:
-            profiles = [
-                p
-                for p in self._profiles.values()
-                if p.connections or p.total_requests > 0
-            ]
-            # Compute per-IP request rates
-            for p in profiles:
-                ts_list = self._ip_request_timestamps.get(p.ip, [])
-                p.request_rate_per_min = float(len(ts_list))
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever any profile data changes."""
+        return self._version
 
-        profiles.sort(
-            key=lambda p: (p.active_connections, p.total_requests), reverse=True
-        )
+    def get_profiles(self) -> tuple[IPProfile, ...]:
+        """Get IP profiles with activity, with computed per-IP request rates.
+
+        Returns the shared snapshot; repeated calls between updates return
+        the same tuple.
+        """
+        # A published snapshot is immutable and swapped by reference, so it
+        # can be read without waiting on writers
+        profiles = self._snapshot
+        if profiles is None:
+            with self._lock:
+                profiles = self._active_profiles()
         return profiles
 
     def get_profile(self, ip: str) -> IPProfile | None:
@@ -135,18 +295,14 @@ class CorrelationEngine:
     def get_aggregate_stats(self) -> AggregateStats:
         """Compute aggregate dashboard stats."""
         with self._lock:
-            profiles = list(self._profiles.values())
+            unique_ips = len(self._active_profiles())
             bandwidth = self._bandwidth
-            req_count = len(self._request_timestamps)
-
-        total_conns = sum(len(p.connections) for p in profiles)
-        established = sum(
-            sum(1 for c in p.connections if c.state == TCPState.ESTABLISHED)
-            for p in profiles
-        )
-        unique_ips = len([p for p in profiles if p.connections or p.log_entries])
-        total_requests = sum(p.total_requests for p in profiles)
-        total_bytes = sum(p.total_bytes_sent for p in profiles)
+            self._advance_rpm(time.monotonic())
+            req_count = sum(self._rpm_buckets)
+            total_conns = self._total_conns
+            established = self._established
+            total_requests = self._total_requests
+            total_bytes = self._total_bytes
 
         return AggregateStats(
             total_connections=total_conns,
@@ -161,13 +317,10 @@ class CorrelationEngine:
     def get_offender_summary(self) -> OffenderSummary:
         """Compute top offender metrics for the summary bar."""
         with self._lock:
-            req_count = len(self._request_timestamps)
+            self._advance_rpm(time.monotonic())
+            req_count = sum(self._rpm_buckets)
             new_conn_count = len(self._new_conn_timestamps)
-            profiles = [
-                p
-                for p in self._profiles.values()
-                if p.connections or p.total_requests > 0
-            ]
+            profiles = self._active_profiles()
             # Per-IP rates
             ip_rates = {
                 ip: float(len(ts))
@@ -179,16 +332,14 @@ class CorrelationEngine:
         new_conns_per_sec = new_conn_count / 60.0
 
         # Top 3 by request rate
-        sorted_by_rate = sorted(ip_rates.items(), key=lambda x: x[1], reverse=True)
-        top_by_requests = sorted_by_rate[:3]
+        top_by_requests = heapq.nlargest(3, ip_rates.items(), key=itemgetter(1))
 
         # Top 3 by connection count
-        sorted_by_conns = sorted(
+        top_by_conns = heapq.nlargest(
+            3,
             [(p.ip, len(p.connections)) for p in profiles if p.connections],
-            key=lambda x: x[1],
-            reverse=True,
+            key=itemgetter(1),
         )
-        top_by_conns = sorted_by_conns[:3]
 
         return OffenderSummary(
             req_per_sec=req_per_sec,
@@ -198,21 +349,39 @@ class CorrelationEngine:
         )
 
     def trim_stale_profiles(self, max_age_seconds: int = 120) -> None:
-        """Remove profiles with no connections and no recent activity."""
-        cutoff = datetime.now().astimezone()
+        """Remove profiles with no connections and no recent activity.
+
+        Only visits queued candidates rather than every tracked profile.
+        """
+        cutoff = datetime.now().astimezone() - timedelta(seconds=max_age_seconds)
         with self._lock:
-            to_remove = []
-            for ip, profile in self._profiles.items():
-                if profile.connections:
-                    continue
-                if profile.total_requests == 0 and not profile.connections:
-                    to_remove.append(ip)
-                    continue
+            idle, self._idle_ips = self._idle_ips, set()
+            for ip in idle:
+                profile = self._profiles.get(ip)
                 if (
-                    profile.last_seen
-                    and (cutoff - profile.last_seen).total_seconds() > max_age_seconds
+                    profile is not None
+                    and not profile.connections
+                    and profile.total_requests == 0
                 ):
-                    to_remove.append(ip)
-            for ip in to_remove:
-                del self._profiles[ip]
-                self._known_conn_ips.discard(ip)
+                    self._drop(ip)
+
+            heap = self._expiry_heap
+            while heap and heap[0][0] < cutoff:
+                last_seen, ip = heapq.heappop(heap)
+                profile = self._profiles.get(ip)
+                # Skip entries superseded by newer activity or a reconnect
+                if (
+                    profile is not None
+                    and not profile.connections
+                    and profile.last_seen == last_seen
+                ):
+                    self._drop(ip)
+
+            # Superseded entries linger until popped; rebuild if they pile up
+            if len(heap) > 4 * len(self._profiles) + 64:
+                heap[:] = [
+                    (p.last_seen, ip)
+                    for ip, p in self._profiles.items()
+                    if not p.connections and p.total_requests and p.last_seen
+                ]
+                heapq.heapify(heap)
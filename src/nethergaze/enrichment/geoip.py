@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
 from nethergaze.models import GeoInfo
@@ -17,12 +19,15 @@ except ImportError:
 
 
 class GeoIPLookup:
-    """MaxMind GeoLite2 lookup with in-memory caching."""
+    """MaxMind GeoLite2 lookup with a bounded in-memory LRU cache."""
 
-    def __init__(self, city_db: str, asn_db: str):
+    def __init__(self, city_db: str, asn_db: str, max_entries: int = 10_000):
         self._city_reader = None
         self._asn_reader = None
-        self._cache: dict[str, GeoInfo] = {}
+        # Lookups arrive from both the connection and log worker threads
+        self._cache: OrderedDict[str, GeoInfo] = OrderedDict()
+        self._cache_max = max_entries
+        self._cache_lock = threading.Lock()
 
         if not HAS_GEOIP2:
             return
@@ -49,12 +54,15 @@ class GeoIPLookup:
 
     def lookup(self, ip: str) -> GeoInfo:
         """Look up GeoIP info for an IP address. Returns default GeoInfo on failure."""
-        if ip in self._cache:
-            return self._cache[ip]
+        with self._cache_lock:
+            info = self._cache.get(ip)
+            if info is not None:
+                self._cache.move_to_end(ip)
+                return info
 
         if is_private_ip(ip):
             info = GeoInfo(country_code="--", country_name="Private", city="LAN")
-            self._cache[ip] = info
+            self._remember(ip, info)
             return info
 
         info = GeoInfo()
@@ -79,9 +87,15 @@ class GeoIPLookup:
             except (geoip2.errors.AddressNotFoundError, ValueError):
                 pass
 
-        self._cache[ip] = info
+        self._remember(ip, info)
         return info
 
+    def _remember(self, ip: str, info: GeoInfo) -> None:
+        with self._cache_lock:
+            self._cache[ip] = info
+            if len(self._cache) > self._cache_max:
+                self._cache.popitem(last=False)
+
     def close(self) -> None:
         """Close database readers."""
         if self._city_reader:
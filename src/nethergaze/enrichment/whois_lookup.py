@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import json
 import logging
+import os
+import queue
 import threading
 import time
 from pathlib import Path
@@ -22,6 +24,12 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+_CACHE_FILE = "whois_cache.jsonl"
+# Pre-JSONL cache file; read once for migration, removed on compaction
+_LEGACY_CACHE_FILE = "whois_cache.json"
+# Lookups allowed to wait for a worker; more are refused until it drains
+_MAX_QUEUED = 256
+
 
 class WhoisLookupService:
     """Threaded whois/RDAP lookup service with TTL cache."""
@@ -33,12 +41,18 @@ class WhoisLookupService:
         cache_dir: str | None = None,
     ):
         self._cache: dict[str, tuple[WhoisInfo, float]] = {}
-        self._pending: set[str] = set()
+        # Queued or running lookups and the callbacks waiting on each
+        self._inflight: dict[str, list[Callable[[str, WhoisInfo], None]]] = {}
+        self._lookup_q: queue.Queue[str | None] = queue.Queue(maxsize=_MAX_QUEUED)
+        self._workers: list[threading.Thread] = []
+        self._max_workers = max_workers
         self._lock = threading.Lock()
         self._disk_lock = threading.Lock()
+        # Serialized cache lines for the disk writer thread; None stops it
+        self._write_q: queue.Queue[str | None] = queue.Queue()
+        self._writer: threading.Thread | None = None
         self._cache_ttl = cache_ttl
         self._cache_dir = Path(cache_dir) if cache_dir else None
-        self._semaphore = threading.Semaphore(max_workers)
         self._shutting_down = False
 
         if self._cache_dir:
@@ -56,11 +70,20 @@ class WhoisLookupService:
         """Request whois lookup for an IP. Returns cached result or None.
 
         If a callback is provided and no cached result exists, the lookup
-        is performed in a background daemon thread and callback is called with results.
+        is queued for a background worker thread and callback is called with
+        results. Concurrent requests for the same IP share one lookup.
         """
         if is_private_ip(ip):
             return WhoisInfo(network_name="Private", network_cidr="N/A")
 
+        # Fresh hits need no lock: dict.get is atomic and entries are
+        # replaced whole, never mutated
+        cached = self._cache.get(ip)
+        if cached is not None and not self._shutting_down:
+            info, ts = cached
+            if time.time() - ts < self._cache_ttl:
+                return info
+
         with self._lock:
             if self._shutting_down:
                 return None
@@ -72,83 +95,93 @@ class WhoisLookupService:
                 # Expired — remove
                 del self._cache[ip]
 
-            if ip in self._pending:
+            waiting = self._inflight.get(ip)
+            if waiting is not None:
+                # Already queued or running: share that lookup's result
+                if callback:
+                    waiting.append(callback)
                 return None
 
-            self._pending.add(ip)
-
-        if not HAS_IPWHOIS:
-            with self._lock:
-                self._pending.discard(ip)
-            return None
+            if not HAS_IPWHOIS:
+                return None
 
-        t = threading.Thread(
-            target=self._do_lookup,
-            args=(ip, callback),
-            name=f"whois-{ip}",
-            daemon=True,
-        )
-        t.start()
+            try:
+                self._lookup_q.put_nowait(ip)
+            except queue.Full:
+                return None  # burst backlog; the caller asks again next refresh
+            self._inflight[ip] = [callback] if callback else []
+            if not self._workers:
+                for n in range(self._max_workers):
+                    worker = threading.Thread(
+                        target=self._worker_loop, name=f"whois-{n}", daemon=True
+                    )
+                    worker.start()
+                    self._workers.append(worker)
         return None
 
+    def is_pending(self, ip: str) -> bool:
+        """Whether a lookup for this IP is queued or running."""
+        return ip in self._inflight
+
     def get_cached(self, ip: str) -> WhoisInfo | None:
         """Get cached whois info without triggering a lookup."""
-        with self._lock:
-            if ip in self._cache:
-                info, ts = self._cache[ip]
-                if time.time() - ts < self._cache_ttl:
-                    return info
+        cached = self._cache.get(ip)
+        if cached is not None:
+            info, ts = cached
+            if time.time() - ts < self._cache_ttl:
+                return info
         return None
 
-    def _do_lookup(
-        self,
-        ip: str,
-        callback: Callable[[str, WhoisInfo], None] | None,
-    ) -> None:
-        """Perform RDAP lookup with legacy whois fallback in background thread."""
-        self._semaphore.acquire()
-        try:
-            if self._shutting_down:
+    def _worker_loop(self) -> None:
+        """Serve queued IPs until shutdown posts a None."""
+        while True:
+            ip = self._lookup_q.get()
+            if ip is None:
                 return
-            info = WhoisInfo()
+            self._do_lookup(ip)
+
+    def _do_lookup(self, ip: str) -> None:
+        """Perform RDAP lookup with legacy whois fallback on a worker thread."""
+        if self._shutting_down:
+            return
+        info = WhoisInfo()
+        try:
+            obj = IPWhois(ip, timeout=10)
+            try:
+                info = self._extract_rdap(obj.lookup_rdap(depth=1))
+            finally:
+                self._close_ipwhois(obj)
+        except IPDefinedError:
+            info.network_name = "Private/Reserved"
+        except Exception as e:
+            logger.debug("RDAP failed for %s: %s — trying legacy whois", ip, e)
             try:
                 obj = IPWhois(ip, timeout=10)
                 try:
-                    info = self._extract_rdap(obj.lookup_rdap(depth=1))
+                    info = self._extract_legacy(obj.lookup_whois())
                 finally:
                     self._close_ipwhois(obj)
             except IPDefinedError:
                 info.network_name = "Private/Reserved"
-            except Exception as e:
-                logger.debug("RDAP failed for %s: %s — trying legacy whois", ip, e)
-                try:
-                    obj = IPWhois(ip, timeout=10)
-                    try:
-                        info = self._extract_legacy(obj.lookup_whois())
-                    finally:
-                        self._close_ipwhois(obj)
-                except IPDefinedError:
-                    info.network_name = "Private/Reserved"
-                except Exception as e2:
-                    logger.debug("Legacy whois also failed for %s: %s", ip, e2)
-
-            # Only cache if we actually got useful data
-            if info.network_name != "?" or info.network_cidr != "?":
-                with self._lock:
-                    self._cache[ip] = (info, time.time())
-                    self._pending.discard(ip)
-                self._save_to_disk(ip, info)
-            else:
-                with self._lock:
-                    self._pending.discard(ip)
-
-            if callback and not self._shutting_down:
-                try:
-                    callback(ip, info)
-                except Exception:
-                    logger.debug("Whois callback failed for %s", ip, exc_info=True)
-        finally:
-            self._semaphore.release()
+            except Exception as e2:
+                logger.debug("Legacy whois also failed for %s: %s", ip, e2)
+
+        # Only cache if we actually got useful data
+        useful = info.network_name != "?" or info.network_cidr != "?"
+        with self._lock:
+            if useful:
+                self._cache[ip] = (info, time.time())
+            callbacks = self._inflight.pop(ip, [])
+        if useful:
+            self._queue_disk_write(ip, info)
+
+        if self._shutting_down:
+            return
+        for callback in callbacks:
+            try:
+                callback(ip, info)
+            except Exception:
+                logger.debug("Whois callback failed for %s", ip, exc_info=True)
 
     @staticmethod
     def _close_ipwhois(obj) -> None:
@@ -209,61 +242,142 @@ class WhoisLookupService:
         return info
 
     def _load_disk_cache(self) -> None:
-        """Load cached whois results from disk."""
+        """Load cached whois results from disk; later lines win."""
         if not self._cache_dir:
             return
-        cache_file = self._cache_dir / "whois_cache.json"
-        if not cache_file.exists():
-            return
+        entries: dict[str, dict] = {}
+        legacy_file = self._cache_dir / _LEGACY_CACHE_FILE
+        if legacy_file.exists():
+            try:
+                data = json.loads(legacy_file.read_text())
+                if isinstance(data, dict):
+                    entries.update(data)
+            except (OSError, json.JSONDecodeError):
+                pass
         try:
-            data = json.loads(cache_file.read_text())
-            now = time.time()
-            for ip, entry in data.items():
-                ts = entry.get("_ts", 0)
-                if now - ts < self._cache_ttl:
-                    info = WhoisInfo(
-                        network_name=entry.get("network_name", "?"),
-                        network_cidr=entry.get("network_cidr", "?"),
-                        description=entry.get("description", ""),
-                        abuse_contact=entry.get("abuse_contact", ""),
-                    )
-                    # Skip loading entries that were failed lookups
-                    if info.network_name == "?" and info.network_cidr == "?":
-                        continue
-                    self._cache[ip] = (info, ts)
-        except (json.JSONDecodeError, KeyError, TypeError):
+            with open(self._cache_dir / _CACHE_FILE) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        entries[entry["ip"]] = entry
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        continue  # e.g. a line torn by a crash mid-append
+        except OSError:
             pass
 
-    def _save_to_disk(self, ip: str, info: WhoisInfo) -> None:
-        """Persist a single whois result to disk cache.
-
-        Uses a dedicated lock to prevent concurrent read-modify-write corruption
-        when multiple whois worker threads complete simultaneously.
-        """
-        if not self._cache_dir:
-            return
-
-        with self._disk_lock:
-            self._cache_dir.mkdir(parents=True, exist_ok=True)
-            cache_file = self._cache_dir / "whois_cache.json"
-
+        now = time.time()
+        for ip, entry in entries.items():
             try:
-                if cache_file.exists():
-                    data = json.loads(cache_file.read_text())
-                else:
-                    data = {}
-            except (json.JSONDecodeError, TypeError):
-                data = {}
-
-            data[ip] = {
+                ts = entry.get("_ts", 0)
+                if now - ts >= self._cache_ttl:
+                    continue
+                info = WhoisInfo(
+                    network_name=entry.get("network_name", "?"),
+                    network_cidr=entry.get("network_cidr", "?"),
+                    description=entry.get("description", ""),
+                    abuse_contact=entry.get("abuse_contact", ""),
+                )
+            except (AttributeError, TypeError):
+                continue
+            # Skip loading entries that were failed lookups
+            if info.network_name == "?" and info.network_cidr == "?":
+                continue
+            self._cache[ip] = (info, ts)
+
+    @staticmethod
+    def _disk_record(ip: str, info: WhoisInfo, ts: float) -> str:
+        return json.dumps(
+            {
+                "ip": ip,
                 "network_name": info.network_name,
                 "network_cidr": info.network_cidr,
                 "description": info.description,
                 "abuse_contact": info.abuse_contact,
-                "_ts": time.time(),
+                "_ts": ts,
             }
-            cache_file.write_text(json.dumps(data, indent=2))
+        )
+
+    def _append_lines(self, lines: list[str]) -> None:
+        """Append serialized records to the disk cache in one write.
+
+        One line per lookup instead of rewriting the whole file; duplicates
+        are resolved on load and squeezed out by _compact_disk().
+        """
+        with self._disk_lock:
+            try:
+                self._cache_dir.mkdir(parents=True, exist_ok=True)
+                with open(self._cache_dir / _CACHE_FILE, "a") as f:
+                    f.writelines(lines)
+            except OSError:
+                logger.debug("Could not append to whois cache", exc_info=True)
+
+    def _queue_disk_write(self, ip: str, info: WhoisInfo) -> None:
+        """Hand a result to the writer thread so lookup workers never block on I/O."""
+        if not self._cache_dir or self._shutting_down:
+            return
+        self._write_q.put(self._disk_record(ip, info, time.time()) + "\n")
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._writer_loop, name="whois-writer", daemon=True
+                )
+                self._writer.start()
+
+    def _writer_loop(self) -> None:
+        """Append queued cache lines, batching whatever piled up meanwhile."""
+        while True:
+            items = [self._write_q.get()]
+            while True:
+                try:
+                    items.append(self._write_q.get_nowait())
+                except queue.Empty:
+                    break
+            lines = [item for item in items if item is not None]
+            if lines:
+                self._append_lines(lines)
+            for _ in items:
+                self._write_q.task_done()
+            if len(lines) != len(items):
+                return
+
+    def _compact_disk(self) -> None:
+        """Rewrite the disk cache from the live in-memory entries."""
+        if not self._cache_dir:
+            return
+        now = time.time()
+        with self._lock:
+            live = [
+                (ip, info, ts)
+                for ip, (info, ts) in self._cache.items()
+                if now - ts < self._cache_ttl
+            ]
+        with self._disk_lock:
+            cache_file = self._cache_dir / _CACHE_FILE
+            tmp_file = cache_file.with_suffix(".jsonl.tmp")
+            try:
+                self._cache_dir.mkdir(parents=True, exist_ok=True)
+                with open(tmp_file, "w") as f:
+                    f.writelines(
+                        self._disk_record(ip, info, ts) + "\n" for ip, info, ts in live
+                    )
+                os.replace(tmp_file, cache_file)
+                (self._cache_dir / _LEGACY_CACHE_FILE).unlink(missing_ok=True)
+            except OSError:
+                logger.debug("Could not compact whois cache", exc_info=True)
 
     def shutdown(self) -> None:
-        """Signal all threads to stop."""
+        """Signal all threads to stop and compact the disk cache."""
+        if self._shutting_down:
+            return  # the app calls this from both quit and unmount
         self._shutting_down = True
+        with self._lock:
+            writer = self._writer
+            for _ in self._workers:
+                try:
+                    self._lookup_q.put_nowait(None)
+                except queue.Full:
+                    break  # workers also bail out on _shutting_down
+        if writer is not None:
+            self._write_q.put(None)
+            writer.join(timeout=5)
+        self._compact_disk()
@@ -3,7 +3,10 @@
 from __future__ import annotations
 
 import ipaddress
+import re
+from bisect import bisect_right
 from dataclasses import dataclass, field
+from functools import lru_cache
 
 from nethergaze.models import IPProfile, LogEntry, TCPState
 
@@ -26,8 +29,23 @@ SCANNER_PATTERNS = [
 
 def has_scanner_ua(user_agent: str) -> bool:
     """Check if user-agent matches known scanner patterns."""
-    ua_lower = user_agent.lower()
-    return any(p in ua_lower for p in SCANNER_PATTERNS)
+    return _ua_is_scanner(user_agent, ())
+
+
+@lru_cache(maxsize=64)
+def _scanner_regex(extra: tuple[str, ...]) -> re.Pattern[str]:
+    """One alternation over the built-in and extra patterns (lowercase).
+
+    Matched against the lowered UA: re.IGNORECASE is ~10x slower here.
+    """
+    patterns = SCANNER_PATTERNS + [p.lower() for p in extra]
+    return re.compile("|".join(map(re.escape, patterns)))
+
+
+@lru_cache(maxsize=4096)
+def _ua_is_scanner(user_agent: str, extra: tuple[str, ...]) -> bool:
+    # A busy log repeats a small set of user agents, so memoize the verdict
+    return _scanner_regex(extra).search(user_agent.lower()) is not None
 
 
 def ip_in_networks(
@@ -42,17 +60,84 @@ def ip_in_networks(
     return any(addr in net for net in networks)
 
 
+@lru_cache(maxsize=1 << 16)
+def _ip_key(ip: str) -> tuple[int, int] | None:
+    """(version, integer value) of an address; parsed once per distinct IP."""
+    try:
+        addr = ipaddress.ip_address(ip)
+    except ValueError:
+        return None
+    return addr.version, int(addr)
+
+
+class CidrIndex:
+    """Sorted, merged address ranges for O(log n) network membership tests."""
+
+    __slots__ = ("_ranges",)
+
+    def __init__(
+        self, networks: list[ipaddress.IPv4Network | ipaddress.IPv6Network]
+    ) -> None:
+        # Per IP version: (starts, ends) of disjoint inclusive ranges
+        self._ranges: dict[int, tuple[list[int], list[int]]] = {}
+        spans: dict[int, list[tuple[int, int]]] = {}
+        for net in networks:
+            spans.setdefault(net.version, []).append(
+                (int(net.network_address), int(net.broadcast_address))
+            )
+        for version, pairs in spans.items():
+            pairs.sort()
+            starts: list[int] = []
+            ends: list[int] = []
+            for lo, hi in pairs:
+                if ends and lo <= ends[-1] + 1:
+                    ends[-1] = max(ends[-1], hi)
+                else:
+                    starts.append(lo)
+                    ends.append(hi)
+            self._ranges[version] = (starts, ends)
+
+    def __contains__(self, ip: str) -> bool:
+        key = _ip_key(ip)
+        if key is None:
+            return False
+        version, value = key
+        ranges = self._ranges.get(version)
+        if ranges is None:
+            return False
+        starts, ends = ranges
+        i = bisect_right(starts, value) - 1
+        return i >= 0 and value <= ends[i]
+
+
+@lru_cache(maxsize=16)
+def _cidr_index(
+    networks: tuple[ipaddress.IPv4Network | ipaddress.IPv6Network, ...],
+) -> CidrIndex:
+    # Filters derived via replace() share the index for the same networks
+    return CidrIndex(list(networks))
+
+
 def parse_cidr_list(
     cidrs: list[str],
 ) -> list[ipaddress.IPv4Network | ipaddress.IPv6Network]:
     """Parse a list of CIDR strings into network objects, skipping invalid."""
+    return list(_parse_cidrs(tuple(cidrs)))
+
+
+@lru_cache(maxsize=16)
+def _parse_cidrs(
+    cidrs: tuple[str, ...],
+) -> tuple[ipaddress.IPv4Network | ipaddress.IPv6Network, ...]:
+    # Config lists are reparsed whenever a dashboard is built; the network
+    # objects are immutable, so callers can share one parse per input
     nets: list[ipaddress.IPv4Network | ipaddress.IPv6Network] = []
     for cidr in cidrs:
         try:
             nets.append(ipaddress.ip_network(cidr.strip(), strict=False))
         except ValueError:
             pass
-    return nets
+    return tuple(nets)
 
 
 def parse_status_code_spec(spec: str) -> list[tuple[int, int]] | None:
@@ -109,12 +194,28 @@ def parse_tcp_states(spec: str) -> set[TCPState] | None:
     return states if states else None
 
 
-@dataclass
+_STATUS_BITMAP_SIZE = 1000
+
+
+@lru_cache(maxsize=16)
+def _build_status_bitmap(ranges: tuple[tuple[int, int], ...]) -> bytes:
+    """Build a table where byte N is 1 if status N falls in any range."""
+    table = bytearray(_STATUS_BITMAP_SIZE)
+    for lo, hi in ranges:
+        lo = max(lo, 0)
+        hi = min(hi, _STATUS_BITMAP_SIZE - 1)
+        if lo <= hi:
+            table[lo : hi + 1] = b"\x01" * (hi + 1 - lo)
+    return bytes(table)
+
+
+@dataclass(frozen=True, slots=True)
 class FilterState:
     """Composable filter predicates for dashboard views.
 
     Normal mode: all active criteria AND-composed.
     Suspicious mode: matches any suspicious pattern (OR logic).
+    Immutable: derive variants with dataclasses.replace().
     """
 
     tcp_states: set[TCPState] | None = None
@@ -134,6 +235,17 @@ class FilterState:
     suspicious_min_conns: int = 5
     extra_scanner_patterns: list[str] = field(default_factory=list)
 
+    # Lookup structures derived from the fields above on first use
+    _status_bitmap: bytes | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _allow_index: CidrIndex | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _deny_index: CidrIndex | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     @property
     def is_active(self) -> bool:
         return (
@@ -147,50 +259,114 @@ class FilterState:
         )
 
     def matches_profile(self, profile: IPProfile) -> bool:
-        """Return True if profile passes all active filters."""
+        """Return True if profile passes all active filters.
+
+        Profiles tracked by CorrelationEngine carry a revision, so the
+        verdict is reused until the profile changes or another filter runs.
+        """
+        rev = profile._rev
+        if rev is None:
+            return self._matches_profile(profile)
+        memo = profile._filter_memo
+        if memo is not None and memo[0] is self and memo[1] == rev:
+            return memo[2]
+        result = self._matches_profile(profile)
+        profile._filter_memo = (self, rev, result)
+        return result
+
+    def _matches_profile(self, profile: IPProfile) -> bool:
         if self.suspicious_mode:
             return self._is_suspicious(profile)
 
-        if self.cidr_allow and not ip_in_networks(profile.ip, self.cidr_allow):
-            return False
-        if self.cidr_deny and ip_in_networks(profile.ip, self.cidr_deny):
+        if (self.cidr_allow or self.cidr_deny) and not self._cidr_allowed(profile.ip):
             return False
         if self.tcp_states is not None:
-            conn_states = {c.state for c in profile.connections}
-            if not conn_states & self.tcp_states:
+            if self.tcp_states.isdisjoint(_conn_states(profile)):
                 return False
         if self.min_request_rate is not None:
             if profile.request_rate_per_min < self.min_request_rate:
                 return False
         if self.text_filter is not None:
-            text = f"{profile.ip} {profile.as_org}".lower()
+            text = profile._filter_text or profile_filter_text(profile)
             if self.text_filter not in text:
                 return False
         return True
 
     def matches_log_entry(self, entry: LogEntry) -> bool:
         """Return True if log entry passes active filters."""
-        if self.cidr_allow and not ip_in_networks(entry.remote_ip, self.cidr_allow):
-            return False
-        if self.cidr_deny and ip_in_networks(entry.remote_ip, self.cidr_deny):
+        if (self.cidr_allow or self.cidr_deny) and not self._cidr_allowed(
+            entry.remote_ip
+        ):
             return False
         if self.status_codes is not None:
-            if not any(lo <= entry.status_code <= hi for lo, hi in self.status_codes):
+            if not self._status_allowed(entry.status_code):
                 return False
         if self.text_filter is not None:
-            text = (
-                f"{entry.remote_ip} {entry.status_code} {entry.method} {entry.path}"
-            ).lower()
-            if self.text_filter not in text:
+            if self.text_filter not in entry_filter_text(entry):
+                return False
+        return True
+
+    def filter_log_entries(self, entries: list[LogEntry]) -> list[LogEntry]:
+        """Return the entries that pass active filters, in order.
+
+        Same result as matches_log_entry per entry, but each active filter
+        runs as its own pass over the survivors so the per-filter setup
+        (bitmap, indexes, needle) is resolved once per batch.
+        """
+        if self.cidr_allow or self.cidr_deny:
+            cidr_allowed = self._cidr_allowed
+            entries = [e for e in entries if cidr_allowed(e.remote_ip)]
+        if self.status_codes is not None and entries:
+            self._status_allowed(0)  # builds the bitmap
+            bitmap = self._status_bitmap
+            size = _STATUS_BITMAP_SIZE
+            status_allowed = self._status_allowed
+            entries = [
+                e
+                for e in entries
+                if (
+                    bitmap[e.status_code]
+                    if 0 <= e.status_code < size
+                    else status_allowed(e.status_code)
+                )
+            ]
+        if self.text_filter is not None and entries:
+            needle = self.text_filter
+            entries = [e for e in entries if needle in entry_filter_text(e)]
+        return entries
+
+    def _cidr_allowed(self, ip: str) -> bool:
+        """Apply cidr_allow and cidr_deny through cached range indexes."""
+        if self.cidr_allow:
+            index = self._allow_index
+            if index is None:
+                index = _cidr_index(tuple(self.cidr_allow))
+                object.__setattr__(self, "_allow_index", index)
+            if ip not in index:
+                return False
+        if self.cidr_deny:
+            index = self._deny_index
+            if index is None:
+                index = _cidr_index(tuple(self.cidr_deny))
+                object.__setattr__(self, "_deny_index", index)
+            if ip in index:
                 return False
         return True
 
+    def _status_allowed(self, code: int) -> bool:
+        """Check a status code against status_codes via a byte lookup table."""
+        bitmap = self._status_bitmap
+        if bitmap is None:
+            bitmap = _build_status_bitmap(tuple(self.status_codes))
+            object.__setattr__(self, "_status_bitmap", bitmap)
+        if 0 <= code < _STATUS_BITMAP_SIZE:
+            return bool(bitmap[code])
+        return any(lo <= code <= hi for lo, hi in self.status_codes)
+
     def _is_suspicious(self, profile: IPProfile) -> bool:
         """Check any suspicious pattern (OR logic)."""
         # SYN_RECV with no completed requests
-        if profile.total_requests == 0 and any(
-            c.state == TCPState.SYN_RECV for c in profile.connections
-        ):
+        if profile.total_requests == 0 and TCPState.SYN_RECV in _conn_states(profile):
             return True
         # High connections, zero/low requests
         if (
@@ -230,7 +406,28 @@ class FilterState:
         return " + ".join(parts)
 
 
+def profile_filter_text(profile: IPProfile) -> str:
+    """Lowercased text the text filter searches for a profile."""
+    return f"{profile.ip} {profile.as_org}".lower()
+
+
+def entry_filter_text(entry: LogEntry) -> str:
+    """Lowercased text the text filter searches for a log entry, cached on it."""
+    text = entry._filter_text
+    if text is None:
+        text = entry._filter_text = (
+            f"{entry.remote_ip} {entry.status_code} {entry.method} {entry.path}"
+        ).lower()
+    return text
+
+
+def _conn_states(profile: IPProfile) -> frozenset[TCPState]:
+    """Connection states, from the engine's cache when it has filled it."""
+    states = profile._conn_states
+    if states is None:
+        states = frozenset(c.state for c in profile.connections)
+    return states
+
+
 def _has_any_scanner_ua(user_agent: str, extra: list[str]) -> bool:
-    ua_lower = user_agent.lower()
-    patterns = SCANNER_PATTERNS + [p.lower() for p in extra]
-    return any(p in ua_lower for p in patterns)
+    return _ua_is_scanner(user_agent, tuple(extra))
@@ -23,11 +23,11 @@ class TCPState(Enum):
     CLOSING = 11
 
     @classmethod
-    def from_hex(cls, hex_str: str) -> TCPState:
+    def from_hex(cls, hex_str: str | bytes) -> TCPState:
         return cls(int(hex_str, 16))
 
 
-@dataclass
+@dataclass(slots=True)
 class Connection:
     """A single TCP connection from /proc/net/tcp."""
 
@@ -41,7 +41,7 @@ class Connection:
     process_name: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class LogEntry:
     """A parsed HTTP server access log entry."""
 
@@ -55,9 +55,13 @@ class LogEntry:
     referrer: str
     user_agent: str
     raw_line: str = ""
+    # Lowercased text for the dashboard text filter, filled in on first use
+    _filter_text: str | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
 
-@dataclass
+@dataclass(slots=True)
 class GeoInfo:
     """GeoIP lookup result for an IP address."""
 
@@ -70,7 +74,7 @@ class GeoInfo:
     as_org: str = "?"
 
 
-@dataclass
+@dataclass(slots=True)
 class WhoisInfo:
     """Whois/RDAP lookup result for an IP address."""
 
@@ -80,7 +84,7 @@ class WhoisInfo:
     abuse_contact: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class IPProfile:
     """Aggregated profile for a single IP address across all data sources."""
 
@@ -94,6 +98,19 @@ class IPProfile:
     total_bytes_sent: int = 0
     total_requests: int = 0
     request_rate_per_min: float = 0.0
+    # Filter-path derivations kept current by CorrelationEngine; None = unknown
+    _conn_states: frozenset[TCPState] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _filter_text: str | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Bumped by CorrelationEngine on every change; None = not tracked
+    _rev: int | None = field(default=None, init=False, repr=False, compare=False)
+    # (filter, _rev, result) of the last FilterState.matches_profile
+    _filter_memo: tuple[object, int, bool] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @property
     def active_connections(self) -> int:
@@ -116,7 +133,7 @@ class IPProfile:
         return "?"
 
 
-@dataclass
+@dataclass(slots=True)
 class OffenderSummary:
     """Top offender metrics for the summary bar."""
 
@@ -126,7 +143,7 @@ class OffenderSummary:
     top_by_conns: list[tuple[str, int]] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ActionHook:
     """User-defined action triggered by a keybind on the selected IP."""
 
@@ -135,7 +152,7 @@ class ActionHook:
     command: str  # {ip} placeholder
 
 
-@dataclass
+@dataclass(slots=True)
 class BandwidthStats:
     """Monthly bandwidth statistics from vnstat."""
 
@@ -143,7 +160,7 @@ class BandwidthStats:
     tx_bytes: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class AggregateStats:
     """Aggregate dashboard statistics."""
 
@@ -9,7 +9,11 @@ from textual.containers import Horizontal, Vertical
 from textual.screen import ModalScreen
 from textual.widgets import Button, Static
 
-from nethergaze.actions import detect_firewall, generate_block_command
+from nethergaze.actions import (
+    detect_firewall,
+    generate_block_argv,
+    generate_block_command,
+)
 
 
 class BlockScreen(ModalScreen[bool]):
@@ -63,6 +67,7 @@ class BlockScreen(ModalScreen[bool]):
         self._allow_execute = allow_execute
         self._firewall = detect_firewall()
         self._command = generate_block_command(ip, self._firewall)
+        self._command_argv = generate_block_argv(ip, self._firewall)
 
     def compose(self) -> ComposeResult:
         with Vertical(id="block-dialog"):
@@ -88,10 +93,12 @@ class BlockScreen(ModalScreen[bool]):
         self.dismiss(False)
 
     def _execute_block(self) -> None:
+        if self._command_argv is None:
+            self.notify("No supported firewall detected", severity="error")
+            return
         try:
             result = subprocess.run(
-                self._command,
-                shell=True,
+                self._command_argv,
                 capture_output=True,
                 text=True,
                 timeout=10,
@@ -2,18 +2,16 @@
 
 from __future__ import annotations
 
+from dataclasses import replace
+from typing import TYPE_CHECKING
+
 from textual.app import ComposeResult
 from textual.containers import Horizontal
 from textual.screen import Screen
 from textual.widgets import Footer, Input
 
-from nethergaze.collectors.bandwidth import get_bandwidth
+from nethergaze.collectors.bandwidth import get_bandwidth_async
 from nethergaze.collectors.connections import get_connections
-from nethergaze.collectors.logs import LogWatcher, MultiLogWatcher
-from nethergaze.config import AppConfig
-from nethergaze.correlation import CorrelationEngine
-from nethergaze.enrichment.geoip import GeoIPLookup
-from nethergaze.enrichment.whois_lookup import WhoisLookupService
 from nethergaze.filters import FilterState, parse_cidr_list
 from nethergaze.models import ActionHook
 from nethergaze.utils import is_private_ip
@@ -23,6 +21,18 @@ from nethergaze.widgets.http_log import HttpActivityLog
 from nethergaze.widgets.offenders_bar import OffendersBar
 from nethergaze.widgets.stats_bar import StatsBar
 
+if TYPE_CHECKING:
+    from textual.timer import Timer
+
+    from nethergaze.collectors.logs import LogWatcher, MultiLogWatcher
+    from nethergaze.config import AppConfig
+    from nethergaze.correlation import CorrelationEngine
+    from nethergaze.enrichment.geoip import GeoIPLookup
+    from nethergaze.enrichment.whois_lookup import WhoisLookupService
+
+# Coalescing window for redraws triggered by whois results
+_WHOIS_REFRESH_DELAY = 0.25
+
 
 class DashboardScreen(Screen):
     """Main dashboard screen with all monitoring widgets."""
@@ -51,6 +61,9 @@ class DashboardScreen(Screen):
             extra_scanner_patterns=config.scanner_user_agents,
         )
         self._pre_suspicious_filters: FilterState | None = None
+        # Engine version and filters the table was last built from
+        self._table_source: tuple[int, FilterState] | None = None
+        self._refresh_timer: Timer | None = None
 
         # Parse action hooks from config
         self._action_hooks: list[ActionHook] = []
@@ -62,6 +75,10 @@ class DashboardScreen(Screen):
                 self._action_hooks.append(
                     ActionHook(key=key, label=label, command=command)
                 )
+        # on_key runs for every keystroke; the first hook for a key wins
+        self._hook_by_key: dict[str, ActionHook] = {}
+        for hook in self._action_hooks:
+            self._hook_by_key.setdefault(hook.key, hook)
 
     def compose(self) -> ComposeResult:
         yield HeaderBar()
@@ -77,6 +94,13 @@ class DashboardScreen(Screen):
         yield Footer()
 
     def on_mount(self) -> None:
+        # Refresh paths touch these several times per tick; look them up once
+        self._header = self.query_one(HeaderBar)
+        self._offenders = self.query_one(OffendersBar)
+        self._table = self.query_one(ConnectionsTable)
+        self._log = self.query_one(HttpActivityLog)
+        self._stats = self.query_one(StatsBar)
+        self._filter_input = self.query_one("#filter-input", Input)
         self.set_interval(
             self.config.connections_interval,
             self._poll_connections,
@@ -91,7 +115,7 @@ class DashboardScreen(Screen):
         )
         self.set_interval(60.0, self._trim_stale)
         # Rescan for new log files every 30s (only relevant for glob-based MultiLogWatcher)
-        if isinstance(self.log_watcher, MultiLogWatcher):
+        if hasattr(self.log_watcher, "rescan"):
             self.set_interval(30.0, self.log_watcher.rescan)
         # Initial bandwidth check
         self._poll_bandwidth()
@@ -99,55 +123,44 @@ class DashboardScreen(Screen):
     def _poll_connections(self) -> None:
         self._run_connections_worker()
 
-    @property
-    def _header(self) -> HeaderBar:
-        return self.query_one(HeaderBar)
-
-    @property
-    def _table(self) -> ConnectionsTable:
-        return self.query_one(ConnectionsTable)
-
-    @property
-    def _log(self) -> HttpActivityLog:
-        return self.query_one(HttpActivityLog)
-
-    @property
-    def _stats(self) -> StatsBar:
-        return self.query_one(StatsBar)
-
-    @property
-    def _offenders(self) -> OffendersBar:
-        return self.query_one(OffendersBar)
-
     # --- Selected IP helper ---
 
     def _get_selected_ip(self) -> str | None:
         """Get the IP from the currently selected row in the connections table."""
-        table = self.query_one("#conn-table")
-        try:
-            row = table.get_row_at(table.cursor_row)
-            return str(row[0]) if row else None
-        except Exception:
-            return None
+        return self._table.selected_ip
 
     # --- Enrichment ---
 
-    def _enrich_ip(self, ip: str) -> None:
-        if is_private_ip(ip):
+    def _enrich_ips(self, ips: set[str]) -> None:
+        """Resolve GeoIP and queue whois once per distinct IP in a poll."""
+        want_geo = self.geoip is not None and self.geoip.available
+        want_whois = self.whois is not None and self.whois.available
+        if not (want_geo or want_whois):
             return
-        profile = self.engine.get_profile(ip)
-        if not profile:
-            return
-        if self.geoip and self.geoip.available and profile.geo is None:
-            geo = self.geoip.lookup(ip)
-            self.engine.update_geo(ip, geo)
-        if self.whois and self.whois.available and profile.whois is None:
-
-            def _on_whois(looked_ip, info):
-                self.engine.update_whois(looked_ip, info)
-                self.app.call_from_thread(self._refresh_table)
-
-            self.whois.lookup(ip, callback=_on_whois)
+        geos = {}
+        for ip in ips:
+            if is_private_ip(ip):
+                continue
+            profile = self.engine.get_profile(ip)
+            if not profile:
+                continue
+            if want_geo and profile.geo is None:
+                geos[ip] = self.geoip.lookup(ip)
+            if want_whois and profile.whois is None:
+                # The other poller may already have this IP in flight
+                if self.whois.is_pending(ip):
+                    continue
+                info = self.whois.lookup(ip, callback=self._on_whois)
+                if info is not None:
+                    self.engine.update_whois(ip, info)
+        if geos:
+            self.engine.update_geos(geos)
+
+    def _on_whois(self, ip: str, info) -> None:
+        self.engine.update_whois(ip, info)
+        # Cold starts finish many lookups at once; a longer window lets a
+        # burst of results share one redraw
+        self.app.call_from_thread(self._schedule_refresh, _WHOIS_REFRESH_DELAY)
 
     # --- Data polling workers ---
 
@@ -157,12 +170,8 @@ class DashboardScreen(Screen):
                 include_private=self.config.show_private_ips,
             )
             self.engine.update_connections(connections)
-            seen = set()
-            for conn in connections:
-                if conn.remote_ip not in seen:
-                    seen.add(conn.remote_ip)
-                    self._enrich_ip(conn.remote_ip)
-            self.app.call_from_thread(self._refresh_table)
+            self._enrich_ips({conn.remote_ip for conn in connections})
+            self.app.call_from_thread(self._schedule_refresh)
 
         self.run_worker(_work, thread=True, exclusive=True, group="connections")
 
@@ -179,34 +188,51 @@ class DashboardScreen(Screen):
             if not entries:
                 return
             self.engine.update_log_entries(entries)
-            seen = set()
-            for entry in entries:
-                if entry.remote_ip not in seen:
-                    seen.add(entry.remote_ip)
-                    self._enrich_ip(entry.remote_ip)
+            self._enrich_ips({entry.remote_ip for entry in entries})
+            # Filter here so only displayed rows cross to the UI thread;
+            # FilterState is immutable, so reading it off-thread is safe
+            filters = self._filters
+            if filters.is_active:
+                entries = filters.filter_log_entries(entries)
             self.app.call_from_thread(self._on_new_log_entries, entries)
 
         self.run_worker(_work, thread=True, exclusive=True, group="logs")
 
     def _poll_bandwidth(self) -> None:
-        def _work() -> None:
-            stats = get_bandwidth(interface=self.config.interface)
+        async def _work() -> None:
+            stats = await get_bandwidth_async(interface=self.config.interface)
             if stats:
                 self.engine.update_bandwidth(stats)
-            self.app.call_from_thread(self._refresh_bandwidth, stats)
+            self._refresh_bandwidth(stats)
 
-        self.run_worker(_work, thread=True, exclusive=True, group="bandwidth")
+        self.run_worker(_work(), exclusive=True, group="bandwidth")
 
     # --- UI refresh (main thread) ---
 
+    def _schedule_refresh(self, delay: float = 0.1) -> None:
+        """Coalesce background refresh requests into one redraw.
+
+        Requests made while a redraw is pending join it, whatever their delay.
+        """
+        if self._refresh_timer is None:
+            self._refresh_timer = self.set_timer(delay, self._scheduled_refresh)
+
+    def _scheduled_refresh(self) -> None:
+        self._refresh_timer = None
+        self._refresh_table()
+
     def _refresh_table(self) -> None:
-        profiles = self.engine.get_profiles()
+        # Rebuild the table only if profiles or filters changed since last time
+        source = (self.engine.version, self._filters)
+        if source != self._table_source:
+            self._table_source = source
+            profiles = self.engine.get_profiles()
 
-        # Apply filters to connections table
-        if self._filters.is_active:
-            profiles = [p for p in profiles if self._filters.matches_profile(p)]
+            # Apply filters to connections table
+            if self._filters.is_active:
+                profiles = [p for p in profiles if self._filters.matches_profile(p)]
 
-        self._table.update_data(profiles)
+            self._table.update_data(profiles)
 
         stats = self.engine.get_aggregate_stats()
         self._stats.update_stats(stats, self._filters)
@@ -218,11 +244,10 @@ class DashboardScreen(Screen):
         self._header.set_suspicious_mode(self._filters.suspicious_mode)
 
     def _on_new_log_entries(self, entries) -> None:
-        # Apply filters to log entries
-        if self._filters.is_active:
-            entries = [e for e in entries if self._filters.matches_log_entry(e)]
-        self._log.add_entries(entries)
-        self._refresh_table()
+        # Already filtered by the log worker
+        if entries:
+            self._log.add_entries(entries)
+        self._schedule_refresh()
 
     def _refresh_bandwidth(self, stats) -> None:
         self._header.update_bandwidth(stats)
@@ -257,37 +282,32 @@ class DashboardScreen(Screen):
         ip = self._get_selected_ip()
         if ip:
             self.notify(f"Looking up {ip}...")
-
-            def _on_whois(looked_ip, info):
-                self.engine.update_whois(looked_ip, info)
-                self.app.call_from_thread(self._refresh_table)
-
-            self.whois.lookup(ip, callback=_on_whois)
+            self.whois.lookup(ip, callback=self._on_whois)
 
     def action_filter_log(self) -> None:
         """Toggle the quick text filter input."""
-        filter_input = self.query_one("#filter-input", Input)
-        if filter_input.has_class("visible"):
-            filter_input.remove_class("visible")
-            filter_input.value = ""
-            self._filters.text_filter = None
+        if self._filter_input.has_class("visible"):
+            self._filter_input.remove_class("visible")
+            self._filter_input.value = ""
+            self._filters = replace(self._filters, text_filter=None)
             self._refresh_table()
         else:
-            filter_input.add_class("visible")
-            filter_input.focus()
+            self._filter_input.add_class("visible")
+            self._filter_input.focus()
 
     def on_input_submitted(self, event: Input.Submitted) -> None:
-        if event.input.id == "filter-input":
+        if event.input is self._filter_input:
             text = event.value.strip()
-            self._filters.text_filter = text.lower() if text else None
+            self._filters = replace(
+                self._filters, text_filter=text.lower() if text else None
+            )
             event.input.remove_class("visible")
             self._refresh_table()
 
     def key_escape(self) -> None:
-        filter_input = self.query_one("#filter-input", Input)
-        if filter_input.has_class("visible"):
-            filter_input.remove_class("visible")
-            filter_input.value = ""
+        if self._filter_input.has_class("visible"):
+            self._filter_input.remove_class("visible")
+            self._filter_input.value = ""
 
     def action_open_filters(self) -> None:
         """Open the structured filter modal."""
@@ -308,28 +328,19 @@ class DashboardScreen(Screen):
                 self._filters = self._pre_suspicious_filters
                 self._pre_suspicious_filters = None
             else:
-                self._filters.suspicious_mode = False
+                self._filters = replace(self._filters, suspicious_mode=False)
             self.notify("Suspicious mode OFF")
         else:
-            # Save current state and enable suspicious mode
-            self._pre_suspicious_filters = FilterState(
-                tcp_states=self._filters.tcp_states,
-                status_codes=self._filters.status_codes,
-                min_request_rate=self._filters.min_request_rate,
-                cidr_allow=self._filters.cidr_allow,
-                cidr_deny=self._filters.cidr_deny,
-                text_filter=self._filters.text_filter,
-                suspicious_burst_rpm=self._filters.suspicious_burst_rpm,
-                suspicious_min_conns=self._filters.suspicious_min_conns,
-                extra_scanner_patterns=self._filters.extra_scanner_patterns,
-            )
-            self._filters = FilterState(
+            # Save current state and enable suspicious mode; the CIDR lists
+            # and thresholds carry over by reference
+            self._pre_suspicious_filters = self._filters
+            self._filters = replace(
+                self._filters,
                 suspicious_mode=True,
-                cidr_allow=self._filters.cidr_allow,
-                cidr_deny=self._filters.cidr_deny,
-                suspicious_burst_rpm=self._filters.suspicious_burst_rpm,
-                suspicious_min_conns=self._filters.suspicious_min_conns,
-                extra_scanner_patterns=self._filters.extra_scanner_patterns,
+                tcp_states=None,
+                status_codes=None,
+                min_request_rate=None,
+                text_filter=None,
             )
             self.notify("Suspicious mode ON")
         self._refresh_table()
@@ -360,22 +371,19 @@ class DashboardScreen(Screen):
 
     def on_key(self, event) -> None:
         """Handle custom action hook key presses."""
-        if not self._action_hooks:
+        hook = self._hook_by_key.get(event.character)
+        if hook is None:
             return
         # Don't intercept when filter input is focused
-        filter_input = self.query_one("#filter-input", Input)
-        if filter_input.has_class("visible"):
+        if self._filter_input.has_class("visible"):
             return
-        for hook in self._action_hooks:
-            if event.character == hook.key:
-                ip = self._get_selected_ip()
-                if ip:
-                    self._run_action_hook(hook, ip)
-                else:
-                    self.notify("No IP selected", severity="warning")
-                event.prevent_default()
-                event.stop()
-                return
+        ip = self._get_selected_ip()
+        if ip:
+            self._run_action_hook(hook, ip)
+        else:
+            self.notify("No IP selected", severity="warning")
+        event.prevent_default()
+        event.stop()
 
     def _run_action_hook(self, hook: ActionHook, ip: str) -> None:
         from nethergaze.screens.hook_screen import HookOutputScreen
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from dataclasses import replace
+
 from textual.app import ComposeResult
 from textual.containers import Horizontal, Vertical
 from textual.screen import ModalScreen
@@ -66,38 +68,42 @@ class FilterScreen(ModalScreen[FilterState | None]):
             yield Static(
                 "TCP State (SYN_RECV, ESTABLISHED, ...):", classes="filter-label"
             )
-            yield Input(
+            self._tcp_input = Input(
                 id="tcp-state",
                 placeholder="e.g. SYN_RECV,ESTABLISHED",
                 value=self._prefill_tcp(),
                 classes="filter-input",
             )
+            yield self._tcp_input
 
             yield Static(
                 "Status Codes (4xx, 5xx, 200-299, ...):", classes="filter-label"
             )
-            yield Input(
+            self._status_input = Input(
                 id="status-codes",
                 placeholder="e.g. 4xx,5xx",
                 value=self._prefill_status(),
                 classes="filter-input",
             )
+            yield self._status_input
 
             yield Static("Min Request Rate (req/min):", classes="filter-label")
-            yield Input(
+            self._rate_input = Input(
                 id="min-rate",
                 placeholder="e.g. 60",
                 value=self._prefill_rate(),
                 classes="filter-input",
             )
+            yield self._rate_input
 
             yield Static("Text Filter:", classes="filter-label")
-            yield Input(
+            self._text_input = Input(
                 id="text-filter",
                 placeholder="Free text search",
                 value=self._current.text_filter or "",
                 classes="filter-input",
             )
+            yield self._text_input
 
             with Horizontal(id="filter-buttons"):
                 yield Button("Apply", id="apply", variant="primary")
@@ -124,12 +130,13 @@ class FilterScreen(ModalScreen[FilterState | None]):
             self._apply()
         elif event.button.id == "clear":
             self.dismiss(
-                FilterState(
-                    cidr_allow=self._current.cidr_allow,
-                    cidr_deny=self._current.cidr_deny,
-                    suspicious_burst_rpm=self._current.suspicious_burst_rpm,
-                    suspicious_min_conns=self._current.suspicious_min_conns,
-                    extra_scanner_patterns=self._current.extra_scanner_patterns,
+                replace(
+                    self._current,
+                    tcp_states=None,
+                    status_codes=None,
+                    min_request_rate=None,
+                    text_filter=None,
+                    suspicious_mode=False,
                 )
             )
         elif event.button.id == "cancel":
@@ -139,20 +146,17 @@ class FilterScreen(ModalScreen[FilterState | None]):
         self.dismiss(None)
 
     def _apply(self) -> None:
-        tcp_val = self.query_one("#tcp-state", Input).value.strip()
-        status_val = self.query_one("#status-codes", Input).value.strip()
-        rate_val = self.query_one("#min-rate", Input).value.strip()
-        text_val = self.query_one("#text-filter", Input).value.strip()
+        tcp_val = self._tcp_input.value.strip()
+        status_val = self._status_input.value.strip()
+        rate_val = self._rate_input.value.strip()
+        text_val = self._text_input.value.strip()
 
-        new_filter = FilterState(
+        new_filter = replace(
+            self._current,
             tcp_states=parse_tcp_states(tcp_val),
             status_codes=parse_status_code_spec(status_val),
             min_request_rate=float(rate_val) if rate_val else None,
             text_filter=text_val.lower() if text_val else None,
-            cidr_allow=self._current.cidr_allow,
-            cidr_deny=self._current.cidr_deny,
-            suspicious_burst_rpm=self._current.suspicious_burst_rpm,
-            suspicious_min_conns=self._current.suspicious_min_conns,
-            extra_scanner_patterns=self._current.extra_scanner_patterns,
+            suspicious_mode=False,
         )
         self.dismiss(new_filter)
@@ -10,7 +10,7 @@ from textual.widgets import Button, DataTable, RichLog, Static
 
 from nethergaze.correlation import CorrelationEngine
 from nethergaze.enrichment.whois_lookup import WhoisLookupService
-from nethergaze.models import IPProfile
+from nethergaze.models import IPProfile, LogEntry
 from nethergaze.utils import format_bytes
 
 
@@ -125,23 +125,7 @@ class IPDetailScreen(ModalScreen[None]):
         log = RichLog(id="detail-requests", max_lines=100, wrap=False, markup=False)
         # Show most recent entries
         for entry in self.profile.log_entries[-50:]:
-            status = entry.status_code
-            if status < 300:
-                style = "green"
-            elif status < 400:
-                style = "cyan"
-            elif status < 500:
-                style = "yellow"
-            else:
-                style = "red bold"
-
-            text = Text()
-            text.append(entry.timestamp.strftime("%H:%M:%S"), style="dim")
-            text.append(f" {status} ", style=style)
-            text.append(f"{entry.method:6s} ", style="bold")
-            text.append(entry.path)
-            text.append(f" ({format_bytes(entry.bytes_sent)})", style="dim")
-            log.write(text)
+            log.write(_format_request(entry))
         return log
 
     def on_mount(self) -> None:
@@ -189,23 +173,11 @@ class IPDetailScreen(ModalScreen[None]):
         if new_count > self._last_log_count:
             try:
                 log = self.query_one("#detail-requests", RichLog)
-                for entry in self.profile.log_entries[self._last_log_count :]:
-                    status = entry.status_code
-                    if status < 300:
-                        style = "green"
-                    elif status < 400:
-                        style = "cyan"
-                    elif status < 500:
-                        style = "yellow"
-                    else:
-                        style = "red bold"
-                    text = Text()
-                    text.append(entry.timestamp.strftime("%H:%M:%S"), style="dim")
-                    text.append(f" {status} ", style=style)
-                    text.append(f"{entry.method:6s} ", style="bold")
-                    text.append(entry.path)
-                    text.append(f" ({format_bytes(entry.bytes_sent)})", style="dim")
-                    log.write(text)
+                # Entries past the log's max_lines would be evicted as soon
+                # as they were written, so don't format them
+                start = max(self._last_log_count, new_count - log.max_lines)
+                for entry in self.profile.log_entries[start:]:
+                    log.write(_format_request(entry))
             except Exception:
                 pass
             self._last_log_count = new_count
@@ -233,3 +205,22 @@ class IPDetailScreen(ModalScreen[None]):
             self.query_one("#detail-whois", Static).update(self._whois_text())
         except Exception:
             pass
+
+
+def _format_request(entry: LogEntry) -> Text:
+    status = entry.status_code
+    if status < 300:
+        style = "green"
+    elif status < 400:
+        style = "cyan"
+    elif status < 500:
+        style = "yellow"
+    else:
+        style = "red bold"
+    text = Text()
+    text.append(entry.timestamp.strftime("%H:%M:%S"), style="dim")
+    text.append(f" {status} ", style=style)
+    text.append(f"{entry.method:6s} ", style="bold")
+    text.append(entry.path)
+    text.append(f" ({format_bytes(entry.bytes_sent)})", style="dim")
+    return text
@@ -2,36 +2,44 @@
 
 from __future__ import annotations
 
+import binascii
 import ipaddress
-import struct
+import socket
+from bisect import bisect_right
+from functools import lru_cache
 
 
-def parse_hex_ipv4(hex_str: str) -> str:
+@lru_cache(maxsize=1024)
+def parse_hex_ipv4(hex_str: str | bytes) -> str:
     """Parse a hex-encoded IPv4 address from /proc/net/tcp (little-endian).
 
     /proc/net/tcp stores IPv4 as a little-endian 32-bit hex string.
     E.g., "0100007F" -> 127.0.0.1
     """
-    packed = struct.pack("<I", int(hex_str, 16))
-    return str(ipaddress.IPv4Address(packed))
+    return socket.inet_ntoa(binascii.unhexlify(hex_str)[::-1])
 
 
-def parse_hex_ipv6(hex_str: str) -> str:
+@lru_cache(maxsize=1024)
+def parse_hex_ipv6(hex_str: str | bytes) -> str:
     """Parse a hex-encoded IPv6 address from /proc/net/tcp6.
 
     /proc/net/tcp6 stores IPv6 as four little-endian 32-bit words.
     E.g., "00000000000000000000000001000000" -> ::1
     """
-    words = [hex_str[i : i + 8] for i in range(0, 32, 8)]
-    packed = b"".join(struct.pack("<I", int(w, 16)) for w in words)
-    return str(ipaddress.IPv6Address(packed))
+    b = binascii.unhexlify(hex_str)
+    packed = b[3::-1] + b[7:3:-1] + b[11:7:-1] + b[15:11:-1]
+    return socket.inet_ntop(socket.AF_INET6, packed)
 
 
-def parse_hex_port(hex_str: str) -> int:
+def parse_hex_port(hex_str: str | bytes) -> int:
     """Parse a hex-encoded port number (big-endian)."""
     return int(hex_str, 16)
 
 
+_BYTE_UNITS = ("B", "KiB", "MiB", "GiB", "TiB")
+
+
+@lru_cache(maxsize=4096)
 def format_bytes(num_bytes: int | float) -> str:
     """Format byte count to human-readable string.
 
@@ -40,16 +48,17 @@ def format_bytes(num_bytes: int | float) -> str:
         format_bytes(1023) -> "1023 B"
         format_bytes(1024) -> "1.0 KiB"
         format_bytes(1048576) -> "1.0 MiB"
+
+    Memoized: table rows re-render the same totals on every refresh.
     """
     if num_bytes < 0:
         return f"-{format_bytes(-num_bytes)}"
-    for unit in ("B", "KiB", "MiB", "GiB", "TiB"):
-        if abs(num_bytes) < 1024.0 or unit == "TiB":
-            if unit == "B":
-                return f"{int(num_bytes)} {unit}"
-            return f"{num_bytes:.1f} {unit}"
-        num_bytes /= 1024.0
-    return f"{num_bytes:.1f} TiB"
+    if num_bytes < 1024:
+        return f"{int(num_bytes)} B"
+    # Unit from the bit length; dividing by a power of two is exact, so
+    # this rounds the same as dividing by 1024 once per unit
+    unit = min((int(num_bytes).bit_length() - 1) // 10, 4)
+    return f"{num_bytes / (1 << (10 * unit)):.1f} {_BYTE_UNITS[unit]}"
 
 
 def format_duration(seconds: float) -> str:
@@ -76,8 +85,52 @@ def format_duration(seconds: float) -> str:
     return f"{days}d {hours}h"
 
 
+def _v4_range(cidr: str) -> tuple[int, int]:
+    addr, prefix = cidr.split("/")
+    start = int.from_bytes(socket.inet_aton(addr), "big")
+    return start, start + (1 << (32 - int(prefix))) - 1
+
+
+# Private, loopback, link-local and reserved IPv4 blocks, as (first, last)
+# integer pairs sorted by start. Mirrors ipaddress's is_private/is_loopback/
+# is_reserved/is_link_local so classification needs no address objects.
+_PRIVATE_V4: list[tuple[int, int]] = sorted(
+    _v4_range(cidr)
+    for cidr in (
+        "0.0.0.0/8",
+        "10.0.0.0/8",
+        "127.0.0.0/8",
+        "169.254.0.0/16",
+        "172.16.0.0/12",
+        "192.0.0.0/29",
+        "192.0.0.170/31",
+        "192.0.2.0/24",
+        "192.168.0.0/16",
+        "198.18.0.0/15",
+        "198.51.100.0/24",
+        "203.0.113.0/24",
+        "240.0.0.0/4",
+    )
+)
+_PRIVATE_V4_STARTS = [start for start, _end in _PRIVATE_V4]
+
+
+@lru_cache(maxsize=1 << 16)
 def is_private_ip(ip_str: str) -> bool:
-    """Check whether an IP address is private/reserved."""
+    """Check whether an IP address is private/reserved.
+
+    IPv4 is checked by bisecting a static range table; IPv6 goes through
+    ipaddress. Results are memoized: the same remote IPs recur on every refresh.
+    """
+    try:
+        value = int.from_bytes(socket.inet_pton(socket.AF_INET, ip_str), "big")
+    except OSError:
+        return _is_private_v6(ip_str)
+    idx = bisect_right(_PRIVATE_V4_STARTS, value) - 1
+    return idx >= 0 and value <= _PRIVATE_V4[idx][1]
+
+
+def _is_private_v6(ip_str: str) -> bool:
     try:
         addr = ipaddress.ip_address(ip_str)
         return (
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
+from operator import attrgetter
+
 from textual.app import ComposeResult
 from textual.message import Message
 from textual.widgets import DataTable, Static
@@ -21,8 +24,18 @@ COLUMNS = [
     ("last_path", "Last Path", 30),
 ]
 
+_COLUMN_KEYS = [key for key, _label, _width in COLUMNS]
+
 SORT_KEYS = ["conns", "reqs", "bytes", "ip"]
 
+# Sort key per column, resolved once per sort rather than per row
+_SORT_KEY_FUNCS = {
+    "conns": lambda p: (p.active_connections, len(p.connections)),
+    "reqs": attrgetter("total_requests"),
+    "bytes": attrgetter("total_bytes_sent"),
+    "ip": attrgetter("ip"),
+}
+
 
 class ConnectionsTable(Static):
     """DataTable listing IP profiles with connection and request data."""
@@ -47,7 +60,10 @@ class ConnectionsTable(Static):
         super().__init__()
         self._sort_key = "conns"
         self._sort_reverse = True
-        self._profiles: list[IPProfile] = []
+        self._profiles: Sequence[IPProfile] = ()
+        # IP shown on each row, in display order, and the cells last shown
+        self._ip_by_row: list[str] = []
+        self._cells_by_ip: dict[str, tuple[str, ...]] = {}
 
     def compose(self) -> ComposeResult:
         table = DataTable(id="conn-table", cursor_type="row")
@@ -63,6 +79,14 @@ class ConnectionsTable(Static):
         if row_key and row_key.value:
             self.post_message(self.IPSelected(str(row_key.value)))
 
+    @property
+    def selected_ip(self) -> str | None:
+        """IP of the row under the cursor, if any."""
+        row = self.query_one(DataTable).cursor_row
+        if 0 <= row < len(self._ip_by_row):
+            return self._ip_by_row[row]
+        return None
+
     def cycle_sort(self) -> None:
         """Cycle through sort columns."""
         idx = SORT_KEYS.index(self._sort_key)
@@ -70,7 +94,7 @@ class ConnectionsTable(Static):
         self._sort_reverse = self._sort_key != "ip"
         self.update_data(self._profiles)
 
-    def update_data(self, profiles: list[IPProfile]) -> None:
+    def update_data(self, profiles: Sequence[IPProfile]) -> None:
         """Replace all table data with new profiles."""
         self._profiles = profiles
         table = self.query_one(DataTable)
@@ -78,60 +102,56 @@ class ConnectionsTable(Static):
         # Sort profiles
         sorted_profiles = sorted(
             profiles,
-            key=lambda p: _sort_value(p, self._sort_key),
+            key=_SORT_KEY_FUNCS[self._sort_key],
             reverse=self._sort_reverse,
         )
 
+        rows = [(p.ip, _row_cells(p)) for p in sorted_profiles]
+        order = [ip for ip, _cells in rows]
+        previous = self._cells_by_ip
+        self._cells_by_ip = dict(rows)
+
+        if order == self._ip_by_row:
+            # Same rows in the same order: patch only the cells that changed.
+            # Widths are only re-measured on growth; a shrinking cell would
+            # make DataTable rescan the whole column
+            for ip, cells in rows:
+                for column, old, new in zip(_COLUMN_KEYS, previous[ip], cells):
+                    if old != new:
+                        table.update_cell(
+                            ip, column, new, update_width=len(new) > len(old)
+                        )
+            return
+
         # Remember selected IP (not row index) so cursor survives re-sorting
-        selected_ip: str | None = None
-        try:
-            row = table.get_row_at(table.cursor_row)
-            selected_ip = str(row[0]) if row else None
-        except Exception:
-            pass
+        selected_ip = self.selected_ip
+        self._ip_by_row = order
 
         table.clear()
-        for profile in sorted_profiles:
-            active = profile.active_connections
-            total_conns = len(profile.connections)
-            last_path = ""
-            if profile.log_entries:
-                last = profile.log_entries[-1]
-                last_path = f"{last.method} {last.path}"
-
-            table.add_row(
-                profile.ip,
-                profile.country_code,
-                _truncate(profile.as_org, 24),
-                str(total_conns),
-                f"{active}E" if active else "-",
-                str(profile.total_requests),
-                format_bytes(profile.total_bytes_sent),
-                _truncate(last_path, 30),
-                key=profile.ip,
-            )
+        for ip, cells in rows:
+            table.add_row(*cells, key=ip)
 
         # Restore cursor to the same IP
-        if selected_ip and sorted_profiles:
-            try:
-                for idx, p in enumerate(sorted_profiles):
-                    if p.ip == selected_ip:
-                        table.move_cursor(row=idx)
-                        break
-            except Exception:
-                pass
-
-
-def _sort_value(profile: IPProfile, key: str):
-    if key == "conns":
-        return (profile.active_connections, len(profile.connections))
-    elif key == "reqs":
-        return profile.total_requests
-    elif key == "bytes":
-        return profile.total_bytes_sent
-    elif key == "ip":
-        return profile.ip
-    return 0
+        if selected_ip and selected_ip in self._ip_by_row:
+            table.move_cursor(row=self._ip_by_row.index(selected_ip))
+
+
+def _row_cells(profile: IPProfile) -> tuple[str, ...]:
+    active = profile.active_connections
+    last_path = ""
+    if profile.log_entries:
+        last = profile.log_entries[-1]
+        last_path = f"{last.method} {last.path}"
+    return (
+        profile.ip,
+        profile.country_code,
+        _truncate(profile.as_org, 24),
+        str(len(profile.connections)),
+        f"{active}E" if active else "-",
+        str(profile.total_requests),
+        format_bytes(profile.total_bytes_sent),
+        _truncate(last_path, 30),
+    )
 
 
 def _truncate(text: str, max_len: int) -> str:
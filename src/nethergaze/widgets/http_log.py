@@ -38,7 +38,9 @@ class HttpActivityLog(Static):
     def add_entries(self, entries: list[LogEntry]) -> None:
         """Add new log entries to the log display."""
         log = self.query_one(RichLog)
-        for entry in entries:
+        # A burst longer than max_lines would evict its own oldest rows
+        # straight away, so only format the ones that will stay
+        for entry in entries[-self._max_lines :]:
             log.write(_format_entry(entry))
 
     def clear_log(self) -> None:
@@ -4,10 +4,25 @@ from __future__ import annotations
 
 from unittest.mock import patch
 
-from nethergaze.actions import detect_firewall, generate_block_command
+import pytest
+
+from nethergaze.actions import (
+    _block_argv,
+    detect_firewall,
+    generate_block_argv,
+    generate_block_command,
+)
 from nethergaze.models import ActionHook
 
 
+@pytest.fixture(autouse=True)
+def _clear_firewall_cache():
+    detect_firewall.cache_clear()
+    yield
+    detect_firewall.cache_clear()
+    _block_argv.cache_clear()
+
+
 class TestDetectFirewall:
     def test_ufw_preferred(self):
         with patch(
@@ -38,6 +53,12 @@ class TestDetectFirewall:
         with patch("shutil.which", return_value=None):
             assert detect_firewall() == "unknown"
 
+    def test_result_cached(self):
+        with patch("shutil.which", return_value="/usr/sbin/ufw") as which:
+            detect_firewall()
+            detect_firewall()
+        assert which.call_count == 1
+
 
 class TestGenerateBlockCommand:
     def test_ufw(self):
@@ -58,6 +79,31 @@ class TestGenerateBlockCommand:
         cmd = generate_block_command("1.2.3.4", firewall="unknown")
         assert "manually" in cmd.lower() or "#" in cmd
 
+    def test_default_uses_detected_firewall(self):
+        with patch("shutil.which", side_effect=lambda t: t if t == "nft" else None):
+            assert generate_block_command("1.2.3.4") == generate_block_command(
+                "1.2.3.4", firewall="nft"
+            )
+
+    def test_argv_matches_display_command(self):
+        argv = generate_block_argv("1.2.3.4", firewall="iptables")
+        assert argv == [
+            "sudo",
+            "iptables",
+            "-I",
+            "INPUT",
+            "-s",
+            "1.2.3.4",
+            "-j",
+            "DROP",
+        ]
+        assert generate_block_argv("1.2.3.4", firewall="unknown") is None
+
+    def test_hostile_ip_stays_one_argument(self):
+        ip = "1.2.3.4;reboot"
+        assert generate_block_argv(ip, firewall="ufw")[-1] == ip
+        assert generate_block_command(ip, firewall="ufw").endswith("'1.2.3.4;reboot'")
+
 
 class TestActionHook:
     def test_ip_substitution(self):
@@ -0,0 +1,108 @@
+"""Tests for nethergaze.collectors.bandwidth."""
+
+import sqlite3
+
+import pytest
+
+from nethergaze.collectors import bandwidth
+from nethergaze.collectors.bandwidth import (
+    _read_vnstat_db,
+    get_bandwidth,
+    get_bandwidth_async,
+)
+from nethergaze.models import BandwidthStats
+
+
+@pytest.fixture(autouse=True)
+def _reset_caches():
+    bandwidth._cache.clear()
+    bandwidth._vnstat_path.cache_clear()
+    yield
+    bandwidth._cache.clear()
+    bandwidth._vnstat_path.cache_clear()
+    for conn in bandwidth._db_connections.values():
+        conn.close()
+    bandwidth._db_connections.clear()
+
+
+@pytest.fixture
+def vnstat_db(tmp_path):
+    path = tmp_path / "vnstat.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE interface (id INTEGER PRIMARY KEY, name TEXT);
+        CREATE TABLE month (id INTEGER PRIMARY KEY, interface INTEGER,
+                            date DATE, rx INTEGER, tx INTEGER);
+        INSERT INTO interface VALUES (1, 'eth0'), (2, 'wg0');
+        INSERT INTO month VALUES (1, 1, '2025-01-01', 100, 200);
+        INSERT INTO month VALUES (2, 1, '2025-02-01', 300, 400);
+        INSERT INTO month VALUES (3, 2, '2025-02-01', 5, 6);
+        """
+    )
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+class TestReadVnstatDb:
+    def test_current_month(self, vnstat_db):
+        stats = _read_vnstat_db("eth0", vnstat_db)
+        assert stats == BandwidthStats(rx_bytes=300, tx_bytes=400)
+
+    def test_unknown_interface(self, vnstat_db):
+        assert _read_vnstat_db("eth9", vnstat_db) is None
+
+    def test_missing_db(self, tmp_path):
+        assert _read_vnstat_db("eth0", str(tmp_path / "nope.db")) is None
+
+
+class TestGetBandwidth:
+    def test_result_cached_within_ttl(self, monkeypatch):
+        calls = []
+
+        def fake_db(interface):
+            calls.append(interface)
+            return BandwidthStats(rx_bytes=1, tx_bytes=2)
+
+        monkeypatch.setattr(bandwidth, "_read_vnstat_db", fake_db)
+        assert get_bandwidth("eth0") == get_bandwidth("eth0")
+        assert calls == ["eth0"]
+
+    def test_falls_back_to_cli(self, monkeypatch):
+        monkeypatch.setattr(bandwidth, "_read_vnstat_db", lambda interface: None)
+        monkeypatch.setattr(
+            bandwidth, "_run_vnstat", lambda interface: BandwidthStats(7, 8)
+        )
+        assert get_bandwidth("eth0") == BandwidthStats(7, 8)
+
+    def test_cli_runs_without_holding_lock(self, monkeypatch):
+        monkeypatch.setattr(bandwidth, "_read_vnstat_db", lambda interface: None)
+
+        def fake_cli(interface):
+            assert not bandwidth._lock.locked()
+            return BandwidthStats(7, 8)
+
+        monkeypatch.setattr(bandwidth, "_run_vnstat", fake_cli)
+        assert get_bandwidth("eth0") == BandwidthStats(7, 8)
+
+
+class TestGetBandwidthAsync:
+    async def test_runs_vnstat_cli(self, tmp_path, monkeypatch):
+        script = tmp_path / "vnstat"
+        script.write_text(
+            "#!/bin/sh\n"
+            'echo \'{"interfaces": [{"traffic": {"month": [{"rx": 11, "tx": 22}]}}]}\'\n'
+        )
+        script.chmod(0o755)
+        monkeypatch.setattr(bandwidth, "_read_vnstat_db", lambda interface: None)
+        monkeypatch.setattr(bandwidth, "_vnstat_path", lambda: str(script))
+        assert await get_bandwidth_async("eth0") == BandwidthStats(11, 22)
+
+    async def test_shares_cache_with_sync(self, monkeypatch):
+        monkeypatch.setattr(
+            bandwidth, "_read_vnstat_db", lambda interface: BandwidthStats(1, 2)
+        )
+        get_bandwidth("eth0")
+        monkeypatch.setattr(bandwidth, "_read_vnstat_db", lambda interface: None)
+        assert await get_bandwidth_async("eth0") == BandwidthStats(1, 2)
@@ -0,0 +1,27 @@
+"""Tests for nethergaze.cli."""
+
+from __future__ import annotations
+
+import pytest
+
+from nethergaze import __version__
+from nethergaze.cli import main, parse_args
+
+
+class TestVersion:
+    def test_fast_path(self, capsys):
+        main(["--version"])
+        assert capsys.readouterr().out == f"nethergaze {__version__}\n"
+
+    def test_argparse_version(self, capsys):
+        with pytest.raises(SystemExit):
+            parse_args(["--no-geoip", "--version"])
+        assert __version__ in capsys.readouterr().out
+
+
+class TestParseArgs:
+    def test_flags(self):
+        args = parse_args(["--no-whois", "--log-path", "/tmp/x.log"])
+        assert args.no_whois is True
+        assert args.no_geoip is False
+        assert args.log_path == "/tmp/x.log"
@@ -12,6 +12,7 @@ class TestAppConfig:
         assert default_config.geoip_enabled is True
         assert default_config.whois_enabled is True
         assert default_config.interface == "eth0"
+        assert default_config.max_tracked_ips == 50_000
 
     def test_load_from_toml(self, sample_config):
         config = AppConfig.load(config_path=str(sample_config))
@@ -64,6 +65,13 @@ class TestLogFormatConfig:
         config = AppConfig.load(config_path=str(config_file))
         assert config.log_format == "json"
 
+    def test_keep_raw_line_section_key(self, tmp_path):
+        assert AppConfig().keep_raw_line is False
+        config_file = tmp_path / "config.toml"
+        config_file.write_text("[log]\nkeep_raw_line = true\n")
+        config = AppConfig.load(config_path=str(config_file))
+        assert config.keep_raw_line is True
+
     def test_cli_override(self, tmp_path):
         config_file = tmp_path / "config.toml"
         config_file.write_text('log_format = "combined"\n')
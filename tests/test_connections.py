@@ -1,6 +1,17 @@
 """Tests for nethergaze.collectors.connections."""
 
-from nethergaze.collectors.connections import get_connections
+import shutil
+
+import pytest
+
+from nethergaze.collectors.connections import (
+    InodePidCache,
+    _dump_netlink_connections,
+    _parse_tcp4_line,
+    _parse_tcp6_line,
+    _read_proc_connections,
+    get_connections,
+)
 from nethergaze.models import TCPState
 
 
@@ -27,7 +38,172 @@ class TestGetConnections:
         connections = get_connections(proc_path=str(tmp_path / "nonexistent"))
         assert connections == []
 
+    def test_small_read_buffer_grows(self, tmp_proc, monkeypatch):
+        from nethergaze.collectors import connections
+
+        monkeypatch.setattr(
+            connections._proc_local, "buf", bytearray(16), raising=False
+        )
+        conns = _read_proc_connections(str(tmp_proc))
+        assert len(conns) == 2
+        assert len(connections._proc_buf()) >= (tmp_proc / "net" / "tcp").stat().st_size
+
+    def test_read_buffer_is_per_thread(self):
+        import threading
+
+        from nethergaze.collectors import connections
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(connections._proc_buf()))
+        thread.start()
+        thread.join()
+        assert other[0] is not connections._proc_buf()
+
     def test_established_state(self, tmp_proc):
         connections = get_connections(include_private=True, proc_path=str(tmp_proc))
         established = [c for c in connections if c.state == TCPState.ESTABLISHED]
         assert len(established) >= 1
+
+
+class TestParseTcpLine:
+    def test_tcp4_line(self):
+        line = b"   1: 0100007F:0050 22D8B85D:D431 01 00000000:00000000 00:00000000 00000000     0        0 4242 1 0000000000000000 100 0 0 10 0"
+        conn = _parse_tcp4_line(line)
+        assert conn is not None
+        assert (conn.local_ip, conn.local_port) == ("127.0.0.1", 80)
+        assert (conn.remote_ip, conn.remote_port) == ("93.184.216.34", 54321)
+        assert conn.state == TCPState.ESTABLISHED
+        assert conn.inode == 4242
+
+    def test_tcp6_line(self):
+        line = b"   0: 00000000000000000000000001000000:01BB B80D0120000000000000000001000000:C000 06 00000000:00000000 00:00000000 00000000     0        0 77 1 0000000000000000 100 0 0 10 0"
+        conn = _parse_tcp6_line(line)
+        assert conn is not None
+        assert conn.local_ip == "::1"
+        assert conn.remote_ip == "2001:db8::1"
+        assert conn.state == TCPState.TIME_WAIT
+        assert conn.inode == 77
+
+    def test_header_and_garbage(self):
+        assert (
+            _parse_tcp4_line(b"  sl  local_address rem_address   st tx_queue") is None
+        )
+        assert _parse_tcp4_line(b"") is None
+
+    def test_listen_and_local_remotes_skipped(self):
+        tail = b" 00000000:00000000 00:00000000 00000000     0        0 4242"
+        assert _parse_tcp4_line(b"   1: 0100007F:0050 22D8B85D:D431 0A" + tail) is None
+        assert _parse_tcp4_line(b"   1: 22D8B85D:0050 0100007F:D431 01" + tail) is None
+        assert _parse_tcp4_line(b"   1: 22D8B85D:0050 00000000:0000 07" + tail) is None
+        loopback6 = b"00000000000000000000000001000000"
+        line6 = b"   0: " + loopback6 + b":01BB " + loopback6 + b":C000 01" + tail
+        assert _parse_tcp6_line(line6) is None
+
+    def test_unknown_state(self):
+        line = b"   1: 0100007F:0050 22D8B85D:D431 FF 00000000:00000000 00:00000000 00000000     0        0 4242"
+        assert _parse_tcp4_line(line) is None
+
+
+class TestNetlinkDump:
+    def test_matches_proc_text(self):
+        dumped = _dump_netlink_connections()
+        if dumped is None:
+            pytest.skip("sock_diag netlink not available")
+        parsed = _read_proc_connections("/proc")
+
+        def key(c):
+            return (c.local_ip, c.local_port, c.remote_ip, c.remote_port, c.inode)
+
+        # Sockets come and go between the two reads; compare the stable subset
+        listed = {key(c) for c in parsed if c.state != TCPState.LISTEN}
+        assert {key(c) for c in dumped} & listed or not listed
+        assert all(c.state != TCPState.LISTEN for c in dumped)
+
+
+def _make_pid(proc, pid, comm, starttime, inodes):
+    pid_dir = proc / str(pid)
+    (pid_dir / "fd").mkdir(parents=True)
+    (pid_dir / "comm").write_text(f"{comm}\n")
+    fields = ["S"] + ["0"] * 18 + [str(starttime)] + ["0"] * 5
+    (pid_dir / "stat").write_text(f"{pid} ({comm}) {' '.join(fields)}\n")
+    for fd, inode in enumerate(inodes, start=3):
+        (pid_dir / "fd" / str(fd)).symlink_to(f"socket:[{inode}]")
+    return pid_dir
+
+
+class TestInodePidCache:
+    def test_maps_socket_inodes(self, tmp_path):
+        _make_pid(tmp_path, 42, "nginx", 1000, [111, 222])
+        cache = InodePidCache(str(tmp_path))
+        assert cache.refresh() == {111: (42, "nginx"), 222: (42, "nginx")}
+
+    def test_drops_exited_pid(self, tmp_path):
+        pid_dir = _make_pid(tmp_path, 42, "nginx", 1000, [111])
+        cache = InodePidCache(str(tmp_path))
+        cache.refresh()
+        shutil.rmtree(pid_dir)
+        assert cache.refresh() == {}
+
+    def test_rescans_recycled_pid(self, tmp_path):
+        pid_dir = _make_pid(tmp_path, 42, "nginx", 1000, [111])
+        cache = InodePidCache(str(tmp_path))
+        cache.refresh()
+        shutil.rmtree(pid_dir)
+        _make_pid(tmp_path, 42, "sshd", 2000, [333])
+        assert cache.refresh() == {333: (42, "sshd")}
+
+    def test_parallel_scan(self, tmp_path, monkeypatch):
+        from nethergaze.collectors import connections
+
+        for pid in range(100, 110):
+            _make_pid(tmp_path, pid, f"p{pid}", 1, [pid * 10])
+        monkeypatch.setattr(connections, "_PARALLEL_SCAN_MIN", 0)
+        inode_map = InodePidCache(str(tmp_path)).refresh()
+        assert inode_map == {pid * 10: (pid, f"p{pid}") for pid in range(100, 110)}
+
+    def test_rescans_on_missing_inode(self, tmp_path):
+        pid_dir = _make_pid(tmp_path, 42, "nginx", 1000, [111])
+        cache = InodePidCache(str(tmp_path))
+        cache.refresh()
+        (pid_dir / "fd" / "9").symlink_to("socket:[999]")
+        assert 999 not in cache.refresh()
+        assert cache.refresh([999])[999] == (42, "nginx")
+
+    def test_new_socket_on_known_owner_rescans_only_owners(self, tmp_path, monkeypatch):
+        pid_dir = _make_pid(tmp_path, 42, "nginx", 1000, [111])
+        for pid in range(50, 60):
+            _make_pid(tmp_path, pid, f"idle{pid}", 1000, [])
+        cache = InodePidCache(str(tmp_path))
+        cache.refresh()
+        scans = []
+        scan_pid = cache._scan_pid
+        monkeypatch.setattr(
+            cache, "_scan_pid", lambda pid: scans.append(pid) or scan_pid(pid)
+        )
+
+        (pid_dir / "fd" / "9").symlink_to("socket:[999]")
+        assert cache.refresh([111, 999])[999] == (42, "nginx")
+        assert scans == [42]
+
+        # A socket on a PID that had none still falls back to a full scan
+        scans.clear()
+        (tmp_path / "50" / "fd" / "3").symlink_to("socket:[555]")
+        assert cache.refresh([555])[555] == (50, "idle50")
+        assert scans[0] == 42 and sorted(scans[1:]) == list(range(50, 60))
+
+    def test_unresolvable_inodes_rescan_once(self, tmp_path, monkeypatch):
+        _make_pid(tmp_path, 42, "nginx", 1000, [111])
+        cache = InodePidCache(str(tmp_path))
+        cache.refresh()
+        scans = []
+        scan_pid = cache._scan_pid
+        monkeypatch.setattr(
+            cache, "_scan_pid", lambda pid: scans.append(pid) or scan_pid(pid)
+        )
+        cache.refresh([0, 111])
+        assert scans == []
+        cache.refresh([555, 111])
+        cache.refresh([555, 111])
+        assert scans == [42]
+        cache.refresh([666])
+        assert scans == [42, 42]
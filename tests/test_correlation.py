@@ -1,8 +1,11 @@
 """Tests for nethergaze.correlation."""
 
+import time
+from dataclasses import replace
 from datetime import datetime, timezone
 
 from nethergaze.correlation import CorrelationEngine
+from nethergaze.filters import FilterState
 from nethergaze.models import (
     BandwidthStats,
     Connection,
@@ -70,6 +73,23 @@ class TestCorrelationEngine:
         assert p.total_requests == 2
         assert p.total_bytes_sent == 2048
 
+    def test_interleaved_batch_grouped_per_ip(self):
+        engine = CorrelationEngine()
+        entries = [
+            _make_log_entry("1.2.3.4", "/a"),
+            _make_log_entry("9.9.9.9", "/x"),
+            _make_log_entry("1.2.3.4", "/b"),
+        ]
+        engine.update_log_entries(entries)
+
+        p = engine.get_profile("1.2.3.4")
+        assert [e.path for e in p.log_entries] == ["/a", "/b"]
+        assert p.first_seen == entries[0].timestamp
+        assert p.last_seen == entries[2].timestamp
+        assert engine.get_offender_summary().req_per_sec == 3 / 60.0
+        rates = {p.ip: p.request_rate_per_min for p in engine.get_profiles()}
+        assert rates == {"1.2.3.4": 2.0, "9.9.9.9": 1.0}
+
     def test_connections_replaced_each_update(self):
         engine = CorrelationEngine()
         engine.update_connections([_make_connection("1.2.3.4")])
@@ -89,6 +109,21 @@ class TestCorrelationEngine:
         assert p.geo.country_code == "US"
         assert p.country_code == "US"
 
+    def test_update_geos_batch(self):
+        engine = CorrelationEngine()
+        engine.update_log_entries([_make_log_entry("1.2.3.4")])
+        engine.update_geos(
+            {
+                "1.2.3.4": GeoInfo(country_code="US", as_org="Example"),
+                "5.6.7.8": GeoInfo(country_code="DE"),
+            }
+        )
+        assert engine.get_profile("1.2.3.4").country_code == "US"
+        assert engine.get_profile("5.6.7.8").country_code == "DE"
+        assert FilterState(text_filter="example").matches_profile(
+            engine.get_profile("1.2.3.4")
+        )
+
     def test_update_whois(self):
         engine = CorrelationEngine()
         whois = WhoisInfo(network_name="EXAMPLE-NET", network_cidr="1.2.3.0/24")
@@ -142,3 +177,169 @@ class TestCorrelationEngine:
     def test_get_nonexistent_profile(self):
         engine = CorrelationEngine()
         assert engine.get_profile("9.9.9.9") is None
+
+    def test_rate_windows_expire(self, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+        engine = CorrelationEngine()
+        engine.update_connections([_make_connection("1.2.3.4")])
+        engine.update_log_entries([_make_log_entry("1.2.3.4")])
+
+        clock[0] += 30
+        engine.update_log_entries([_make_log_entry("5.6.7.8")])
+        assert engine.get_aggregate_stats().requests_per_minute == 2
+
+        clock[0] += 45  # first request is now older than 60s
+        engine.update_connections([])
+        engine.update_log_entries([])
+        summary = engine.get_offender_summary()
+        assert summary.req_per_sec == 1 / 60.0
+        assert summary.new_conns_per_sec == 0
+        assert summary.top_by_requests == [("5.6.7.8", 1.0)]
+
+    def test_requests_per_minute_expires_without_updates(self, monkeypatch):
+        clock = [500.25]
+        monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+        engine = CorrelationEngine()
+        engine.update_log_entries([_make_log_entry("1.2.3.4")] * 3)
+        clock[0] += 59.5
+        engine.update_log_entries([_make_log_entry("1.2.3.4")])
+        assert engine.get_aggregate_stats().requests_per_minute == 4
+
+        clock[0] += 1  # the first second has left the window
+        assert engine.get_aggregate_stats().requests_per_minute == 1
+        clock[0] += 3600
+        assert engine.get_aggregate_stats().requests_per_minute == 0
+
+    def test_aggregate_totals_follow_updates_and_trim(self):
+        engine = CorrelationEngine()
+        engine.update_connections(
+            [
+                _make_connection("1.2.3.4"),
+                _make_connection("1.2.3.4", TCPState.TIME_WAIT),
+            ]
+        )
+        engine.update_log_entries(
+            [_make_log_entry("1.2.3.4"), _make_log_entry("5.6.7.8")]
+        )
+        stats = engine.get_aggregate_stats()
+        assert (stats.total_connections, stats.established_connections) == (2, 1)
+        assert (stats.total_requests, stats.total_bytes_sent) == (2, 2048)
+
+        old = _make_log_entry("5.6.7.8")
+        old.timestamp = datetime(2000, 1, 1, tzinfo=timezone.utc)
+        engine.update_log_entries([old])
+        engine.update_connections([_make_connection("9.9.9.9")])
+        engine.trim_stale_profiles()
+        stats = engine.get_aggregate_stats()
+        assert (stats.total_connections, stats.established_connections) == (1, 1)
+        assert (stats.total_requests, stats.total_bytes_sent) == (1, 1024)
+
+    def test_trim_visits_only_candidates(self):
+        engine = CorrelationEngine()
+        engine.update_connections([_make_connection("1.1.1.1")])
+        engine.update_geo("2.2.2.2", GeoInfo(country_code="US"))
+        for ip in ("3.3.3.3", "4.4.4.4"):
+            entry = _make_log_entry(ip)
+            entry.timestamp = datetime(2000, 1, 1, tzinfo=timezone.utc)
+            engine.update_log_entries([entry])
+        engine.update_log_entries([_make_log_entry("4.4.4.4")])  # fresh again
+        engine.update_connections([_make_connection("3.3.3.3")])
+
+        engine.trim_stale_profiles()
+        assert engine.get_profile("1.1.1.1") is None  # disconnected, no requests
+        assert engine.get_profile("2.2.2.2") is None  # enrichment only
+        assert engine.get_profile("3.3.3.3") is not None  # reconnected
+        assert engine.get_profile("4.4.4.4") is not None
+
+        engine.update_connections([])  # 3.3.3.3 drops, its activity is recent
+        engine.trim_stale_profiles(max_age_seconds=0)
+        assert engine.get_profile("3.3.3.3") is None
+        assert engine.get_profile("4.4.4.4") is None
+
+    def test_offender_top_three(self):
+        engine = CorrelationEngine()
+        conns = []
+        for i, ip in enumerate(["1.1.1.1", "2.2.2.2", "3.3.3.3", "4.4.4.4"], start=1):
+            conns += [_make_connection(ip)] * i
+        engine.update_connections(conns)
+        engine.update_log_entries(
+            [_make_log_entry("9.9.9.9")] * 3 + [_make_log_entry("8.8.8.8")]
+        )
+        summary = engine.get_offender_summary()
+        assert summary.top_by_conns == [("4.4.4.4", 4), ("3.3.3.3", 3), ("2.2.2.2", 2)]
+        assert summary.top_by_requests == [("9.9.9.9", 3.0), ("8.8.8.8", 1.0)]
+
+    def test_profile_cap_evicts_least_recent(self):
+        engine = CorrelationEngine(max_profiles=2)
+        engine.update_log_entries([_make_log_entry("1.1.1.1")])
+        engine.update_log_entries([_make_log_entry("2.2.2.2")])
+        engine.update_geo("1.1.1.1", GeoInfo(country_code="US"))  # touch
+        engine.update_log_entries([_make_log_entry("3.3.3.3")])
+
+        assert engine.get_profile("2.2.2.2") is None
+        assert engine.get_profile("1.1.1.1") is not None
+        stats = engine.get_aggregate_stats()
+        assert stats.total_requests == 2
+        assert stats.total_bytes_sent == 2048
+        assert {p.ip for p in engine.get_profiles()} == {"1.1.1.1", "3.3.3.3"}
+
+    def test_profile_snapshot_reused_until_update(self):
+        engine = CorrelationEngine()
+        engine.update_log_entries([_make_log_entry("1.1.1.1")])
+        first = engine.get_profiles()
+        snapshot = engine._snapshot
+        engine.get_aggregate_stats()
+        engine.update_geo("1.1.1.1", GeoInfo(country_code="US"))
+        assert engine.get_profiles() is first
+        assert engine._snapshot is snapshot
+
+        engine.update_log_entries([_make_log_entry("2.2.2.2")] * 2)
+        assert [p.ip for p in engine.get_profiles()] == ["2.2.2.2", "1.1.1.1"]
+        assert engine.get_aggregate_stats().unique_ips == 2
+
+    def test_filter_caches_follow_updates(self):
+        engine = CorrelationEngine()
+        state_filter = FilterState(tcp_states={TCPState.SYN_RECV})
+        text_filter = FilterState(text_filter="example-net")
+
+        engine.update_connections([_make_connection("1.2.3.4", TCPState.SYN_RECV)])
+        profile = engine.get_profile("1.2.3.4")
+        assert state_filter.matches_profile(profile)
+        assert not text_filter.matches_profile(profile)
+
+        engine.update_whois("1.2.3.4", WhoisInfo(network_name="EXAMPLE-NET"))
+        engine.update_connections([_make_connection("1.2.3.4")])
+        assert not state_filter.matches_profile(profile)
+        assert text_filter.matches_profile(profile)
+
+    def test_filter_verdict_memo_follows_profile_and_filter(self):
+        engine = CorrelationEngine()
+        rate_filter = FilterState(min_request_rate=2)
+        engine.update_log_entries([_make_log_entry("1.2.3.4")])
+        profile = engine.get_profiles()[0]
+        assert not rate_filter.matches_profile(profile)
+        memo = profile._filter_memo
+        assert not rate_filter.matches_profile(profile)
+        assert profile._filter_memo is memo
+
+        engine.update_log_entries([_make_log_entry("1.2.3.4")])
+        profile = engine.get_profiles()[0]
+        assert rate_filter.matches_profile(profile)
+
+        rate_filter = replace(rate_filter, min_request_rate=5)
+        assert not rate_filter.matches_profile(profile)
+
+    def test_version_changes_with_visible_data(self):
+        engine = CorrelationEngine()
+        versions = [engine.version]
+        engine.update_connections([_make_connection("1.2.3.4")])
+        versions.append(engine.version)
+        engine.update_log_entries([_make_log_entry("1.2.3.4")])
+        versions.append(engine.version)
+        engine.update_whois("1.2.3.4", WhoisInfo(network_name="NET"))
+        versions.append(engine.version)
+        engine.get_profiles()
+        engine.get_aggregate_stats()
+        assert engine.version == versions[-1]
+        assert len(set(versions)) == len(versions)
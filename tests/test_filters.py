@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+from dataclasses import FrozenInstanceError, replace
 from datetime import datetime, timezone
 
+import pytest
 
 from nethergaze.filters import (
+    CidrIndex,
     FilterState,
     has_scanner_ua,
     parse_cidr_list,
@@ -143,6 +146,32 @@ class TestParseCidrList:
     def test_empty(self):
         assert parse_cidr_list([]) == []
 
+    def test_repeated_parse_reuses_networks(self):
+        first = parse_cidr_list(["10.0.0.0/8", "192.168.0.0/16"])
+        second = parse_cidr_list(["10.0.0.0/8", "192.168.0.0/16"])
+        assert first == second and first is not second
+        assert all(a is b for a, b in zip(first, second))
+
+
+class TestCidrIndex:
+    def test_overlapping_and_adjacent_ranges(self):
+        index = CidrIndex(
+            parse_cidr_list(["10.0.0.0/8", "10.1.0.0/16", "11.0.0.0/8", "192.0.2.0/24"])
+        )
+        assert "10.1.2.3" in index
+        assert "11.255.255.255" in index
+        assert "192.0.2.200" in index
+        assert "12.0.0.0" not in index
+        assert "9.255.255.255" not in index
+        assert "192.0.3.1" not in index
+
+    def test_ipv6_and_invalid(self):
+        index = CidrIndex(parse_cidr_list(["2001:db8::/32", "10.0.0.0/8"]))
+        assert "2001:db8::1" in index
+        assert "2001:db9::1" not in index
+        assert "not-an-ip" not in index
+        assert "::ffff:10.0.0.1" not in index
+
 
 # --- has_scanner_ua ---
 
@@ -157,6 +186,13 @@ class TestScannerUA:
     def test_normal_browser(self):
         assert not has_scanner_ua("Mozilla/5.0 (Windows NT 10.0; Win64; x64)")
 
+    def test_extra_patterns_case_insensitive_and_escaped(self):
+        f = FilterState(suspicious_mode=True, extra_scanner_patterns=["My.Bot+"])
+        assert f.matches_profile(_make_profile(user_agent="x my.bot+/2"))
+        assert not f.matches_profile(_make_profile(user_agent="x myxbot/2"))
+        # Extras do not leak into the default pattern set
+        assert not has_scanner_ua("x my.bot+/2")
+
 
 # --- FilterState.matches_profile ---
 
@@ -216,6 +252,25 @@ class TestFilterStateLogEntry:
         assert not f.matches_log_entry(ok)
         assert f.matches_log_entry(not_found)
 
+    def test_status_code_ranges_follow_replace(self):
+        f = FilterState(status_codes=[(200, 200), (500, 599)])
+        assert f.matches_log_entry(_make_entry(status=200))
+        assert f.matches_log_entry(_make_entry(status=503))
+        assert not f.matches_log_entry(_make_entry(status=201))
+        f = replace(f, status_codes=[(300, 399)])
+        assert f.matches_log_entry(_make_entry(status=301))
+        assert not f.matches_log_entry(_make_entry(status=200))
+
+    def test_replace_shares_cidr_index(self):
+        nets = parse_cidr_list(["10.0.0.0/8"])
+        f = FilterState(cidr_deny=nets)
+        assert not f.matches_log_entry(_make_entry(ip="10.1.1.1"))
+        g = replace(f, suspicious_mode=True, text_filter=None)
+        assert not g.matches_log_entry(_make_entry(ip="10.1.1.1"))
+        assert g._deny_index is f._deny_index
+        with pytest.raises(FrozenInstanceError):
+            f.text_filter = "x"
+
     def test_text_filter_log(self):
         f = FilterState(text_filter="api")
         api = _make_entry(path="/api/data")
@@ -223,6 +278,13 @@ class TestFilterStateLogEntry:
         assert f.matches_log_entry(api)
         assert not f.matches_log_entry(home)
 
+    def test_text_filter_log_caches_lowered_text(self):
+        entry = _make_entry(path="/API/Data")
+        assert FilterState(text_filter="api/data").matches_log_entry(entry)
+        assert entry._filter_text is not None
+        assert FilterState(text_filter="get").matches_log_entry(entry)
+        assert not FilterState(text_filter="post").matches_log_entry(entry)
+
     def test_cidr_deny_log(self):
         nets = parse_cidr_list(["10.0.0.0/8"])
         f = FilterState(cidr_deny=nets)
@@ -231,6 +293,23 @@ class TestFilterStateLogEntry:
         assert not f.matches_log_entry(priv)
         assert f.matches_log_entry(pub)
 
+    def test_filter_log_entries_matches_per_entry_check(self):
+        entries = [
+            _make_entry(ip=ip, status=status, path=path)
+            for ip in ("10.1.2.3", "8.8.8.8")
+            for status in (200, 404, 1200)
+            for path in ("/api/x", "/index.html")
+        ]
+        filters = [
+            FilterState(status_codes=[(400, 499), (1000, 1299)]),
+            FilterState(cidr_deny=parse_cidr_list(["10.0.0.0/8"]), text_filter="api"),
+            FilterState(status_codes=[(200, 200)], text_filter="8.8."),
+        ]
+        for f in filters:
+            expected = [e for e in entries if f.matches_log_entry(e)]
+            assert f.filter_log_entries(entries) == expected
+            assert expected
+
 
 # --- Suspicious mode ---
 
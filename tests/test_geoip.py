@@ -0,0 +1,21 @@
+"""Tests for nethergaze.enrichment.geoip."""
+
+from nethergaze.enrichment.geoip import GeoIPLookup
+
+
+class TestGeoIPCache:
+    def test_cache_bounded_lru(self, tmp_path):
+        geo = GeoIPLookup(
+            str(tmp_path / "missing-city.mmdb"),
+            str(tmp_path / "missing-asn.mmdb"),
+            max_entries=2,
+        )
+        assert not geo.available
+
+        first = geo.lookup("10.0.0.1")
+        geo.lookup("10.0.0.2")
+        assert geo.lookup("10.0.0.1") is first  # hit, now most recent
+        geo.lookup("10.0.0.3")  # evicts 10.0.0.2
+
+        assert list(geo._cache) == ["10.0.0.1", "10.0.0.3"]
+        assert first.country_code == "--"
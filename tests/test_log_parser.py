@@ -1,7 +1,11 @@
 """Tests for nethergaze.collectors.logs."""
 
 import json
+from datetime import datetime, timezone
 
+import pytest
+
+from nethergaze.collectors import logs
 from nethergaze.collectors.logs import (
     LogFormat,
     LogWatcher,
@@ -44,6 +48,13 @@ class TestParseLogLine:
         assert entry is not None
         assert entry.bytes_sent == 0
 
+    def test_non_ascii_user_agent(self):
+        line = '93.184.216.34 - - [01/Jan/2025:12:00:00 +0000] "GET /caf\u00e9 HTTP/1.1" 200 5 "-" "B\u00f6t/1.0 \u722c\u866b"'
+        entry = parse_log_line(line)
+        assert entry is not None
+        assert entry.path == "/caf\u00e9"
+        assert entry.user_agent == "B\u00f6t/1.0 \u722c\u866b"
+
     def test_invalid_line(self):
         assert parse_log_line("this is not a log line") is None
 
@@ -57,6 +68,47 @@ class TestParseLogLine:
         assert entry.timestamp.hour == 8
         assert entry.timestamp.minute == 30
 
+    def test_repeated_timestamp_shared(self):
+        a = parse_log_line(
+            '1.2.3.4 - - [15/Mar/2025:08:30:45 +0100] "GET /a HTTP/1.1" 200 1 "-" "t"'
+        )
+        b = parse_log_line(
+            '5.6.7.8 - - [15/Mar/2025:08:30:45 +0100] "GET /b HTTP/1.1" 200 1 "-" "t"'
+        )
+        assert a.timestamp is b.timestamp
+
+    @pytest.mark.parametrize(
+        "ts",
+        [
+            "01/Jan/2025:00:00:00 +0000",
+            "29/Feb/2024:23:59:59 -0930",
+            "15/mar/2025:08:30:45 +0100",  # strptime fallback
+            "15/Mar/2025:08:30:45 +01:00",  # strptime fallback
+        ],
+    )
+    def test_fast_timestamp_matches_strptime(self, ts):
+        expected = datetime.strptime(ts, "%d/%b/%Y:%H:%M:%S %z")
+        parsed = logs._parse_clf_ts.__wrapped__(ts)
+        assert parsed == expected
+        assert parsed.utcoffset() == expected.utcoffset()
+
+    def test_repeated_fields_interned(self):
+        line = '1.2.3.4 - - [15/Mar/2025:08:30:45 +0100] "GET /a HTTP/1.1" 200 1 "-" "Bot/1.0"'
+        a = parse_log_line(line)
+        # Built at runtime so no field can share a compile-time constant with a
+        b = parse_log_line(line.replace(":45", ":46").replace("/a ", "/b "))
+        assert a.remote_ip is b.remote_ip
+        assert a.method is b.method
+        assert a.protocol is b.protocol
+        assert a.user_agent is b.user_agent
+
+    def test_bad_timestamp_falls_back_to_now(self):
+        entry = parse_log_line(
+            '1.2.3.4 - - [99/Foo/2025:08:30:45 +0100] "GET / HTTP/1.1" 200 1 "-" "t"'
+        )
+        assert entry is not None
+        assert entry.timestamp.tzinfo is not None
+
 
 class TestParseCommonFormat:
     def test_valid_common_line(self):
@@ -154,6 +206,59 @@ class TestParseJsonFormat:
         assert entry is not None
         assert entry.remote_ip == "1.2.3.4"
 
+    @pytest.mark.parametrize(
+        "ts", [1704067200, 1704067200.5, 1704067200.123456, 1704067200.9999999]
+    )
+    def test_epoch_timestamp_matches_fromtimestamp(self, ts):
+        line = json.dumps({"remote_ip": "1.2.3.4", "ts": ts})
+        entry = parse_log_line(line, LogFormat.JSON)
+        assert entry.timestamp == datetime.fromtimestamp(ts).astimezone()
+        assert entry.timestamp.utcoffset() is not None
+
+    def test_string_timestamp_cached(self):
+        a = parse_log_line(
+            json.dumps({"remote_ip": "1.2.3.4", "time": "2025-01-01T12:00:00+00:00"}),
+            LogFormat.JSON,
+        )
+        b = parse_log_line(
+            json.dumps({"remote_ip": "5.6.7.8", "time": "2025-01-01T12:00:00+00:00"}),
+            LogFormat.JSON,
+        )
+        assert a.timestamp.hour == 12
+        assert a.timestamp is b.timestamp
+
+    @pytest.mark.parametrize(
+        "ts",
+        [
+            "2025-01-01T12:00:00+00:00",
+            "2025-01-01T12:00:00Z",
+            "2025-01-01T12:00:00.250Z",
+            "01/Jan/2025:12:00:00 +0000",
+        ],
+    )
+    def test_string_timestamp_layouts(self, ts):
+        entry = parse_log_line(
+            json.dumps({"remote_ip": "1.2.3.4", "time": ts}), LogFormat.JSON
+        )
+        expected = datetime(2025, 1, 1, 12, tzinfo=timezone.utc)
+        assert entry.timestamp.replace(microsecond=0) == expected
+
+    @pytest.mark.parametrize("ts", ["yesterday", float("nan"), 1e300, None])
+    def test_bad_timestamp_falls_back_to_now(self, ts):
+        before = datetime.now().astimezone()
+        entry = parse_log_line(
+            json.dumps({"remote_ip": "1.2.3.4", "ts": ts}), LogFormat.JSON
+        )
+        assert entry.timestamp >= before
+
+    def test_stdlib_decoder_fallback(self, monkeypatch):
+        monkeypatch.setattr(logs, "_json_loads", json.loads)
+        line = json.dumps({"remote_ip": "5.6.7.8", "status": 404, "size": 12})
+        entry = parse_log_line(line, LogFormat.JSON)
+        assert entry is not None
+        assert entry.status_code == 404
+        assert parse_log_line("not json {", LogFormat.JSON) is None
+
 
 class TestAutoDetection:
     def test_auto_detects_combined(self):
@@ -183,6 +288,28 @@ class TestAutoDetection:
         assert entry is not None
         assert entry.remote_ip == "1.2.3.4"
 
+    @pytest.mark.parametrize(
+        "line, fmt",
+        [
+            (
+                '1.2.3.4 - - [01/Jan/2025:12:00:00 +0000] "GET / HTTP/1.1" 200 1 "" ""',
+                LogFormat.COMBINED,
+            ),
+            (
+                '1.2.3.4 - - [01/Jan/2025:12:00:00 +0000] "GET / HTTP/1.1" 200 -  ',
+                LogFormat.COMMON,
+            ),
+            (
+                '1.2.3.4 - - [01/Jan/2025:12:00:00 +0000] "GET / HTTP/1.1" 200 1 "-"',
+                None,
+            ),
+        ],
+    )
+    def test_auto_reports_matched_format(self, line, fmt):
+        entry, detected = logs._parse_auto(line)
+        assert detected is fmt
+        assert (entry is not None) == (fmt is not None)
+
     def test_default_arg_is_auto(self):
         line = '93.184.216.34 - - [01/Jan/2025:12:00:00 +0000] "GET / HTTP/1.1" 200 100 "-" "Mozilla/5.0"'
         entry = parse_log_line(line)
@@ -231,6 +358,21 @@ class TestLogWatcher:
 
         buffered = watcher.get_entries_for_ip("1.2.3.4")
         assert len(buffered) == 2  # capped at max_entries_per_ip
+        assert [e.path for e in buffered] == ["/p3", "/p4"]  # newest kept
+        watcher.close()
+
+    @pytest.mark.parametrize("keep", [False, True])
+    def test_raw_line_opt_in(self, tmp_path, keep):
+        log_file = tmp_path / "access.log"
+        log_file.write_text("")
+        watcher = LogWatcher(str(log_file), keep_raw_line=keep)
+        watcher.poll()
+
+        line = '1.2.3.4 - - [01/Jan/2025:12:00:00 +0000] "GET / HTTP/1.1" 200 1 "-" "t"'
+        with open(log_file, "a") as f:
+            f.write(line + "\n")
+        (entry,) = watcher.poll()
+        assert entry.raw_line == (line if keep else "")
         watcher.close()
 
     def test_poll_json_format(self, tmp_path):
@@ -255,6 +397,111 @@ class TestLogWatcher:
         assert entries[0].path == "/api"
         watcher.close()
 
+    def test_partial_line_held_until_newline(self, tmp_path):
+        log_file = tmp_path / "access.log"
+        log_file.write_text("")
+        watcher = LogWatcher(str(log_file))
+        watcher.poll()
+
+        line = '1.2.3.4 - - [01/Jan/2025:12:00:00 +0000] "GET /caf\u00e9 HTTP/1.1" 200 100 "-" "test"\r\n'
+        raw = line.encode()
+        split = raw.index(b"\xc3") + 1  # inside the UTF-8 sequence
+        with open(log_file, "ab") as f:
+            f.write(raw[:split])
+        assert watcher.poll() == []
+
+        with open(log_file, "ab") as f:
+            f.write(raw[split:])
+        entries = watcher.poll()
+        assert len(entries) == 1
+        assert entries[0].path == "/caf\u00e9"
+        assert entries[0].user_agent == "test"
+        watcher.close()
+
+    def test_auto_format_locks_and_recovers(self, tmp_path):
+        log_file = tmp_path / "access.log"
+        log_file.write_text("")
+        watcher = LogWatcher(str(log_file))
+        watcher.poll()
+
+        with open(log_file, "a") as f:
+            f.write(
+                '1.2.3.4 - - [01/Jan/2025:12:00:00 +0000] "GET / HTTP/1.1" 200 100\n'
+            )
+        assert len(watcher.poll()) == 1
+        assert watcher._detected_format == LogFormat.COMMON
+
+        with open(log_file, "a") as f:
+            f.write(json.dumps({"remote_ip": "5.6.7.8", "status": 200}) + "\n")
+        entries = watcher.poll()
+        assert [e.remote_ip for e in entries] == ["5.6.7.8"]
+        assert watcher._detected_format == LogFormat.JSON
+        watcher.close()
+
+    def test_rotation_by_rename(self, tmp_path):
+        log_file = tmp_path / "access.log"
+        log_file.write_text("")
+        watcher = LogWatcher(str(log_file))
+        watcher.poll()
+
+        log_file.rename(tmp_path / "access.log.1")
+        log_file.write_text(
+            '1.2.3.4 - - [01/Jan/2025:12:00:00 +0000] "GET / HTTP/1.1" 200 100 "-" "test"\n'
+        )
+
+        entries = watcher.poll()
+        assert [e.remote_ip for e in entries] == ["1.2.3.4"]
+        watcher.close()
+
+    def test_polling_fallback(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(logs, "HAS_INOTIFY", False)
+        log_file = tmp_path / "access.log"
+        log_file.write_text("")
+        watcher = LogWatcher(str(log_file))
+        assert watcher._notify is None
+        watcher.poll()
+
+        with open(log_file, "a") as f:
+            f.write(
+                '1.2.3.4 - - [01/Jan/2025:12:00:00 +0000] "GET / HTTP/1.1" 200 100 "-" "test"\n'
+            )
+
+        assert len(watcher.poll()) == 1
+        watcher.close()
+
+    @pytest.mark.skipif(not logs.HAS_INOTIFY, reason="inotify not available")
+    def test_idle_poll_skips_stat(self, tmp_path, monkeypatch):
+        log_file = tmp_path / "access.log"
+        log_file.write_text("")
+        watcher = LogWatcher(str(log_file))
+        watcher.poll()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("idle poll touched the log file")
+
+        monkeypatch.setattr(type(watcher.log_path), "stat", fail)
+        assert watcher.poll() == []
+        watcher.close()
+
+    def test_symlinked_log_is_stat_polled(self, tmp_path):
+        target_dir = tmp_path / "app"
+        target_dir.mkdir()
+        target = target_dir / "current.log"
+        target.write_text("")
+        link = tmp_path / "access.log"
+        link.symlink_to(target)
+        watcher = LogWatcher(str(link))
+        assert watcher._notify is None
+        watcher.poll()
+
+        with open(target, "a") as f:
+            f.write(
+                '1.2.3.4 - - [01/Jan/2025:12:00:00 +0000] "GET / HTTP/1.1" 200 100 "-" "test"\n'
+            )
+
+        assert len(watcher.poll()) == 1
+        watcher.close()
+
 
 class TestMultiLogWatcher:
     def test_rescan_picks_up_new_files(self, tmp_path):
@@ -273,6 +520,59 @@ class TestMultiLogWatcher:
         assert str(log2) in watcher._watchers
         watcher.close()
 
+    @pytest.mark.skipif(not logs.HAS_INOTIFY, reason="inotify not available")
+    def test_poll_picks_up_new_files_without_rescan(self, tmp_path):
+        pattern = str(tmp_path / "*.access.log")
+        watcher = MultiLogWatcher(pattern)
+        assert watcher._watchers == {}
+
+        (tmp_path / "site1.access.log").write_text("")
+        (tmp_path / "other.log").write_text("")
+        watcher.poll()
+        assert list(watcher._watchers) == [str(tmp_path / "site1.access.log")]
+        watcher.close()
+
+    @pytest.mark.skipif(not logs.HAS_INOTIFY, reason="inotify not available")
+    def test_only_changed_files_polled(self, tmp_path):
+        log1 = tmp_path / "site1.access.log"
+        log2 = tmp_path / "site2.access.log"
+        log1.write_text("")
+        log2.write_text("")
+        watcher = MultiLogWatcher(str(tmp_path / "*.access.log"))
+        watcher.poll()
+        assert all(w._notify is None for w in watcher._watchers.values())
+
+        polled = []
+        for path, child in watcher._watchers.items():
+            original = child.poll
+            child.poll = lambda p=path, f=original: polled.append(p) or f()
+
+        with open(log2, "a") as f:
+            f.write(
+                '5.6.7.8 - - [01/Jan/2025:12:00:01 +0000] "GET /b HTTP/1.1" 200 200 "-" "test"\n'
+            )
+        entries = watcher.poll()
+        assert [e.remote_ip for e in entries] == ["5.6.7.8"]
+        assert polled == [str(log2)]
+        watcher.close()
+
+    @pytest.mark.skipif(not logs.HAS_INOTIFY, reason="inotify not available")
+    def test_symlinked_file_polled_without_events(self, tmp_path):
+        target_dir = tmp_path / "app"
+        target_dir.mkdir()
+        target = target_dir / "current.log"
+        target.write_text("")
+        (tmp_path / "site1.access.log").symlink_to(target)
+        watcher = MultiLogWatcher(str(tmp_path / "*.access.log"))
+        watcher.poll()
+
+        with open(target, "a") as f:
+            f.write(
+                '1.2.3.4 - - [01/Jan/2025:12:00:00 +0000] "GET / HTTP/1.1" 200 100 "-" "test"\n'
+            )
+        assert [e.remote_ip for e in watcher.poll()] == ["1.2.3.4"]
+        watcher.close()
+
     def test_rescan_removes_deleted_files(self, tmp_path):
         log1 = tmp_path / "site1.access.log"
         log1.write_text("")
@@ -314,3 +614,45 @@ class TestMultiLogWatcher:
         ips = {e.remote_ip for e in entries}
         assert ips == {"1.2.3.4", "5.6.7.8"}
         watcher.close()
+
+    def test_entries_interleaved_by_timestamp(self, tmp_path):
+        log1 = tmp_path / "site1.access.log"
+        log2 = tmp_path / "site2.access.log"
+        log1.write_text("")
+        log2.write_text("")
+        watcher = MultiLogWatcher(str(tmp_path / "*.access.log"))
+        watcher.poll()
+
+        line = '1.2.3.4 - - [01/Jan/2025:12:00:0{s} +0000] "GET /{s} HTTP/1.1" 200 1 "-" "t"\n'
+        log1.write_text(line.format(s=1) + line.format(s=4))
+        log2.write_text(line.format(s=2) + line.format(s=3))
+
+        entries = watcher.poll()
+        assert [e.path for e in entries] == ["/1", "/2", "/3", "/4"]
+        watcher.close()
+
+    def test_per_ip_buffer_merged_across_files(self, tmp_path):
+        log1 = tmp_path / "site1.access.log"
+        log2 = tmp_path / "site2.access.log"
+        log1.write_text("")
+        log2.write_text("")
+        watcher = MultiLogWatcher(str(tmp_path / "*.access.log"), max_entries_per_ip=3)
+        watcher.poll()
+
+        line = '1.2.3.4 - - [01/Jan/2025:12:00:0{s} +0000] "GET /{s} HTTP/1.1" 200 1 "-" "t"\n'
+        log1.write_text(line.format(s=1) + line.format(s=2))
+        watcher.poll()
+        log2.write_text(line.format(s=3) + line.format(s=4))
+        watcher.poll()
+        assert [e.path for e in watcher.get_entries_for_ip("1.2.3.4")] == [
+            "/2",
+            "/3",
+            "/4",
+        ]
+
+        # Entries from a removed file stay buffered
+        log2.unlink()
+        watcher.rescan()
+        watcher.poll()
+        assert len(watcher.get_entries_for_ip("1.2.3.4")) == 3
+        watcher.close()
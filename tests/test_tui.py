@@ -81,6 +81,14 @@ class TestKeyBindings:
             await pilot.press("exclamation_mark")
             assert not dashboard._filters.suspicious_mode
 
+    @pytest.mark.asyncio
+    async def test_unknown_action_not_delegated(self, test_config):
+        app = _make_app(test_config)
+        async with app.run_test():
+            assert app.action_cycle_sort == app.screen.action_cycle_sort
+            with pytest.raises(AttributeError):
+                app.action_does_not_exist  # noqa: B018
+
     @pytest.mark.asyncio
     async def test_sort_cycle(self, test_config):
         app = _make_app(test_config)
@@ -179,6 +187,25 @@ class TestConnectionsTableWithData:
             table = app.screen.query_one("#conn-table", DataTable)
             assert table.row_count == 2
 
+            # Same order: cells are patched in place
+            profiles[0].total_requests = 11
+            table_widget.update_data(profiles)
+            await pilot.pause()
+            assert table.row_count == 2
+            assert table.get_cell("1.2.3.4", "reqs") == "11"
+
+            # New order: rows are rebuilt
+            profiles[1].connections = [
+                Connection("0.0.0.0", 80, "5.6.7.8", port, TCPState.ESTABLISHED, 0)
+                for port in (200, 201)
+            ]
+            table_widget.update_data(profiles)
+            await pilot.pause()
+            assert [str(table.get_row_at(i)[0]) for i in range(2)] == [
+                "5.6.7.8",
+                "1.2.3.4",
+            ]
+
     @pytest.mark.asyncio
     async def test_cursor_preserves_ip_after_sort(self, test_config):
         app = _make_app(test_config)
@@ -218,6 +245,26 @@ class TestConnectionsTableWithData:
             await pilot.pause()
             row_after = table.get_row_at(table.cursor_row)
             assert str(row_after[0]) == selected_ip
+            assert table_widget.selected_ip == selected_ip
+            assert app.screen._get_selected_ip() == selected_ip
+
+    @pytest.mark.asyncio
+    async def test_background_refreshes_coalesce(self, test_config):
+        app = _make_app(test_config)
+        async with app.run_test() as pilot:
+            screen = app.screen
+            calls = []
+            screen._refresh_table = lambda: calls.append(1)
+            for _ in range(5):
+                screen._schedule_refresh()
+            await pilot.pause(0.3)
+            assert calls == [1]
+            assert screen._refresh_timer is None
+
+            screen._schedule_refresh(0.25)
+            screen._schedule_refresh()
+            await pilot.pause(0.4)
+            assert calls == [1, 1]
 
 
 class TestActionHooks:
@@ -240,3 +287,33 @@ class TestActionHooks:
             assert len(dashboard.action_hooks) == 1
             assert dashboard.action_hooks[0].key == "1"
             assert dashboard.action_hooks[0].label == "Test"
+
+    @pytest.mark.asyncio
+    async def test_hook_key_opens_output_for_selected_ip(self, tmp_path):
+        from nethergaze.screens.hook_screen import HookOutputScreen
+
+        config = AppConfig(
+            log_path="",
+            geoip_enabled=False,
+            whois_enabled=False,
+            connections_interval=999,
+            log_interval=999,
+            bandwidth_interval=999,
+            action_hooks=[
+                {"key": "1", "label": "Test", "command": "echo {ip}"},
+            ],
+        )
+        app = _make_app(config)
+        async with app.run_test() as pilot:
+            # No rows yet: the key only warns
+            await pilot.press("1")
+            await pilot.pause()
+            assert isinstance(app.screen, DashboardScreen)
+
+            app.screen.query_one(ConnectionsTable).update_data(
+                [IPProfile(ip="1.2.3.4", total_requests=1)]
+            )
+            await pilot.pause()
+            await pilot.press("1")
+            await pilot.pause()
+            assert isinstance(app.screen, HookOutputScreen)
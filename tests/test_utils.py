@@ -26,6 +26,9 @@ class TestParseHexIPv4:
         # 1.1.1.1 in little-endian: 01010101
         assert parse_hex_ipv4("01010101") == "1.1.1.1"
 
+    def test_bytes_input(self):
+        assert parse_hex_ipv4(b"0100007F") == "127.0.0.1"
+
 
 class TestParseHexIPv6:
     def test_loopback(self):
@@ -34,6 +37,13 @@ class TestParseHexIPv6:
     def test_any(self):
         assert parse_hex_ipv6("00000000000000000000000000000000") == "::"
 
+    def test_global(self):
+        # 2001:db8::1 as four little-endian 32-bit words
+        assert parse_hex_ipv6("B80D0120000000000000000001000000") == "2001:db8::1"
+
+    def test_v4_mapped(self):
+        assert parse_hex_ipv6("0000000000000000FFFF00000100007F") == "::ffff:127.0.0.1"
+
 
 class TestParseHexPort:
     def test_http(self):
@@ -65,6 +75,13 @@ class TestFormatBytes:
     def test_negative(self):
         assert format_bytes(-1024) == "-1.0 KiB"
 
+    def test_unit_boundaries(self):
+        assert format_bytes(1023) == "1023 B"
+        assert format_bytes(1023.9) == "1023 B"
+        assert format_bytes(1048575) == "1024.0 KiB"
+        assert format_bytes(1536.0) == "1.5 KiB"
+        assert format_bytes(3 * 1024**5) == "3072.0 TiB"
+
 
 class TestFormatDuration:
     def test_seconds(self):
@@ -110,3 +127,17 @@ class TestIsPrivateIP:
 
     def test_link_local(self):
         assert is_private_ip("169.254.1.1") is True
+
+    def test_result_is_cached(self):
+        is_private_ip.cache_clear()
+        assert is_private_ip("8.8.8.8") is False
+        assert is_private_ip("8.8.8.8") is False
+        assert is_private_ip.cache_info().hits == 1
+
+    def test_range_boundaries(self):
+        assert is_private_ip("172.15.255.255") is False
+        assert is_private_ip("172.16.0.0") is True
+        assert is_private_ip("172.31.255.255") is True
+        assert is_private_ip("172.32.0.0") is False
+        assert is_private_ip("255.255.255.255") is True
+        assert is_private_ip("224.0.0.1") is False
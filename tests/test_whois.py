@@ -0,0 +1,165 @@
+"""Tests for nethergaze.enrichment.whois_lookup."""
+
+import json
+import threading
+import time
+
+from nethergaze.enrichment import whois_lookup
+from nethergaze.enrichment.whois_lookup import WhoisLookupService
+from nethergaze.models import WhoisInfo
+
+
+class TestWhoisDiskCache:
+    def test_appends_and_reloads_last_entry(self, tmp_path):
+        svc = WhoisLookupService(cache_dir=str(tmp_path))
+        svc._queue_disk_write("1.2.3.4", WhoisInfo(network_name="OLD"))
+        svc._queue_disk_write("1.2.3.4", WhoisInfo(network_name="NEW"))
+        svc._write_q.join()
+        with open(tmp_path / "whois_cache.jsonl", "a") as f:
+            f.write('{"ip": "5.6.7.8", "network_na')  # torn final line
+
+        lines = (tmp_path / "whois_cache.jsonl").read_text().splitlines()
+        assert len(lines) == 3
+
+        reloaded = WhoisLookupService(cache_dir=str(tmp_path))
+        assert reloaded.get_cached("1.2.3.4").network_name == "NEW"
+        assert reloaded.get_cached("5.6.7.8") is None
+
+    def test_shutdown_compacts_and_migrates_legacy_file(self, tmp_path):
+        legacy = {
+            "9.9.9.9": {
+                "network_name": "LEGACY",
+                "network_cidr": "9.9.9.0/24",
+                "_ts": time.time(),
+            },
+            "8.8.8.8": {"network_name": "STALE", "_ts": 0},
+        }
+        (tmp_path / "whois_cache.json").write_text(json.dumps(legacy))
+        svc = WhoisLookupService(cache_dir=str(tmp_path))
+        svc._append_lines(
+            [
+                svc._disk_record("1.2.3.4", WhoisInfo(network_name=name), time.time())
+                + "\n"
+                for name in ("A", "B")
+            ]
+        )
+        svc._cache["1.2.3.4"] = (WhoisInfo(network_name="B"), time.time())
+
+        svc.shutdown()
+        svc.shutdown()
+
+        assert not (tmp_path / "whois_cache.json").exists()
+        records = [
+            json.loads(line)
+            for line in (tmp_path / "whois_cache.jsonl").read_text().splitlines()
+        ]
+        assert {r["ip"]: r["network_name"] for r in records} == {
+            "9.9.9.9": "LEGACY",
+            "1.2.3.4": "B",
+        }
+
+    def test_writer_thread_appends_queued_results(self, tmp_path):
+        svc = WhoisLookupService(cache_dir=str(tmp_path))
+        for n in range(5):
+            svc._queue_disk_write(f"10.0.0.{n}", WhoisInfo(network_name=f"N{n}"))
+        svc._write_q.join()
+
+        lines = (tmp_path / "whois_cache.jsonl").read_text().splitlines()
+        assert [json.loads(line)["network_name"] for line in lines] == [
+            "N0",
+            "N1",
+            "N2",
+            "N3",
+            "N4",
+        ]
+        svc.shutdown()
+        assert not svc._writer.is_alive()
+
+
+class TestWhoisLookupCache:
+    def test_fresh_hit_and_expired_entry(self, monkeypatch):
+        monkeypatch.setattr(whois_lookup, "HAS_IPWHOIS", False)
+        svc = WhoisLookupService(cache_ttl=60)
+        svc._cache["1.2.3.4"] = (WhoisInfo(network_name="HIT"), time.time())
+        svc._cache["5.6.7.8"] = (WhoisInfo(network_name="OLD"), time.time() - 120)
+
+        assert svc.lookup("1.2.3.4").network_name == "HIT"
+        assert svc.get_cached("5.6.7.8") is None
+        svc.lookup("5.6.7.8")
+        assert "5.6.7.8" not in svc._cache
+
+
+class _FakeRdap:
+    """Per-test stand-in for ipwhois; lookups block until the test releases them."""
+
+    def __init__(self):
+        self.calls: list[str] = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def client(self, ip, timeout=None):
+        return _FakeIPWhois(self, ip)
+
+
+class _FakeIPWhois:
+    """Stands in for ipwhois.IPWhois, recording into its _FakeRdap."""
+
+    def __init__(self, rdap, ip):
+        self.rdap = rdap
+        self.ip = ip
+        self.net = None
+
+    def lookup_rdap(self, depth=1):
+        self.rdap.calls.append(self.ip)
+        self.rdap.started.set()
+        self.rdap.release.wait(5)
+        return {"network": {"name": f"NET-{self.ip}", "cidr": f"{self.ip}/32"}}
+
+
+class TestWhoisLookupQueue:
+    def _service(self, monkeypatch, **kwargs):
+        rdap = _FakeRdap()
+        monkeypatch.setattr(whois_lookup, "HAS_IPWHOIS", True)
+        monkeypatch.setattr(whois_lookup, "IPWhois", rdap.client, raising=False)
+        return WhoisLookupService(**kwargs), rdap
+
+    def test_duplicate_lookups_share_one_request(self, monkeypatch):
+        svc, rdap = self._service(monkeypatch, max_workers=2)
+        results = []
+        done = threading.Semaphore(0)
+
+        def _callback(ip, info):
+            results.append((ip, info.network_name))
+            done.release()
+
+        assert svc.lookup("8.8.8.8", callback=_callback) is None
+        assert svc.lookup("8.8.8.8", callback=_callback) is None
+        rdap.release.set()
+        assert done.acquire(timeout=5) and done.acquire(timeout=5)
+
+        assert rdap.calls == ["8.8.8.8"]
+        assert results == [("8.8.8.8", "NET-8.8.8.8")] * 2
+        assert svc.get_cached("8.8.8.8").network_name == "NET-8.8.8.8"
+        svc.shutdown()
+
+    def test_backlog_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(whois_lookup, "_MAX_QUEUED", 1)
+        svc, rdap = self._service(monkeypatch, max_workers=1)
+        svc.lookup("8.8.8.8")
+        assert rdap.started.wait(5)
+        svc.lookup("8.8.4.4")  # waits in the queue
+        svc.lookup("1.1.1.1")  # refused; not marked in flight
+        assert set(svc._inflight) == {"8.8.8.8", "8.8.4.4"}
+        rdap.release.set()
+        svc.shutdown()
+
+    def test_is_pending_until_lookup_completes(self, monkeypatch):
+        svc, rdap = self._service(monkeypatch, max_workers=1)
+        done = threading.Event()
+        assert not svc.is_pending("8.8.8.8")
+        svc.lookup("8.8.8.8", callback=lambda ip, info: done.set())
+        assert svc.is_pending("8.8.8.8")
+        rdap.release.set()
+        assert done.wait(5)
+        assert not svc.is_pending("8.8.8.8")
+        svc.shutdown()